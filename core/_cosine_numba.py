@@ -0,0 +1,25 @@
+from numba import njit
+
+
+# Serial and nogil rather than parallel=True: recognize_faces runs on every
+# camera worker at once, and numba's default workqueue threading layer aborts
+# the process when parallel kernels are launched from several threads. The
+# camera threads already give the parallelism, without holding the GIL
+@njit(nogil=True, fastmath=True, cache=True)
+def topk_cosine(probes, gallery, out_sim, out_idx):
+    """
+    Best gallery match for each probe in one compiled pass. Rows of both
+    matrices must already be L2-normalized so the dot product is the cosine
+    """
+    for i in range(probes.shape[0]):
+        best = -1.0
+        best_idx = -1
+        for j in range(gallery.shape[0]):
+            s = 0.0
+            for k in range(gallery.shape[1]):
+                s += probes[i, k] * gallery[j, k]
+            if s > best:
+                best = s
+                best_idx = j
+        out_sim[i] = best
+        out_idx[i] = best_idx
@@ -60,7 +60,7 @@ class AlertSystem:
             face_name=face_name,
             age=face.age,
             gender=face.gender,
-            confidence=confidence,
+            confidence=float(confidence),  # recognizer yields a NumPy scalar
             timestamp=timestamp,
             screenshot_path=str(screenshot_path) if screenshot_path is not None else None
         )
@@ -1,10 +1,22 @@
 import bcrypt
 import time
+import hmac
+import hashlib
+import secrets
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, Future
+from collections import OrderedDict, deque
 from dataclasses import dataclass
-from typing import Optional, Dict
+from typing import Optional
 from loguru import logger
 from datetime import datetime, timedelta
 
+# Shared pool for running logins off the caller's thread. bcrypt releases
+# the GIL while hashing, so threads scale across cores without the cost
+# of spawning processes
+_BCRYPT_POOL = ThreadPoolExecutor(max_workers=os.cpu_count() or 4, thread_name_prefix="bcrypt")
+
 @dataclass
 class User:
     id: int
@@ -32,62 +44,171 @@ class Session:
         self.last_activity = time.time()
 
 class AuthManager:
-    def __init__(self, database):
+    MIN_BCRYPT_ROUNDS = 10
+    MAX_BCRYPT_ROUNDS = 14
+    
+    def __init__(self, database, bcrypt_target_ms: int = 250):
         self.database = database
         self.current_session: Optional[Session] = None
         self.session_timeout = 60  # minutes
         self.max_login_attempts = 5
         self.lockout_duration = 300  # 5 minutes in seconds
-        self.failed_attempts: Dict[str, list] = {}
+        # Ordered by last failed attempt, so eviction drops the least recently active
+        self.failed_attempts: OrderedDict[str, deque] = OrderedDict()
+        self.max_tracked_users = 8192
+        self._last_sweep = 0.0
+        
+        # Guards failed_attempts and _verify_cache, which login_async calls
+        # touch from the bcrypt pool threads. Never held while hashing
+        self._lock = threading.Lock()
+        
+        # Cache of recent successful bcrypt verifications (tag -> timestamp)
+        self._verify_cache: OrderedDict[bytes, float] = OrderedDict()
+        self._verify_cache_ttl = 30  # seconds
+        self._verify_cache_size = 256
+        self._cache_key = secrets.token_bytes(32)
+        
+        self._bcrypt_rounds = self._calibrate_bcrypt_rounds(bcrypt_target_ms)
+        
+        # Hash checked against when the username does not exist, so unknown and
+        # known users take the same time to reject. Built here at the calibrated
+        # cost so the first unknown-user login pays no extra hash
+        self._dummy_hash = self.hash_password(secrets.token_urlsafe(16))
+        
+    def _calibrate_bcrypt_rounds(self, target_ms: int) -> int:
+        """
+        Pick the largest bcrypt cost that hashes within target_ms on this CPU.
+        Cost doubles with each round, so one hash at the minimum cost is
+        enough to extrapolate the rest.
+        """
+        rounds = self.MIN_BCRYPT_ROUNDS
+        try:
+            start = time.perf_counter()
+            bcrypt.hashpw(b"cal", bcrypt.gensalt(rounds=rounds))
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            
+            while (rounds < self.MAX_BCRYPT_ROUNDS and
+                   elapsed_ms * 2 ** (rounds + 1 - self.MIN_BCRYPT_ROUNDS) <= target_ms):
+                rounds += 1
+        except Exception as e:
+            logger.error(f"Error calibrating bcrypt cost: {e}")
+        
+        logger.info(f"Using bcrypt cost {rounds}")
+        return rounds
+    
+    @staticmethod
+    def _hash_rounds(hashed: str) -> int:
+        """Extract the cost factor from a bcrypt hash ($2b$<cost>$...)"""
+        try:
+            return int(hashed.split('$')[2])
+        except (IndexError, ValueError):
+            return 0
         
     def hash_password(self, password: str) -> str:
         """Hash a password using bcrypt"""
-        salt = bcrypt.gensalt()
+        salt = bcrypt.gensalt(rounds=self._bcrypt_rounds)
         hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
         return hashed.decode('utf-8')
     
     def verify_password(self, password: str, hashed: str) -> bool:
-        """Verify a password against its hash"""
+        """
+        Verify a password against its hash.
+        Recent successful verifications are cached so repeated logins
+        skip the bcrypt work. Failures are never cached.
+        """
         try:
-            return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
-        except Exception as e:
-            logger.error(f"Error verifying password: {e}")
+            tag = hmac.new(
+                self._cache_key,
+                password.encode('utf-8') + b"|" + hashed.encode('utf-8'),
+                hashlib.sha256
+            ).digest()
+            
+            with self._lock:
+                cached_at = self._verify_cache.get(tag)
+                if cached_at is not None:
+                    if time.time() - cached_at < self._verify_cache_ttl:
+                        return True
+                    del self._verify_cache[tag]
+            
+            if not bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8')):
+                return False
+            
+            with self._lock:
+                self._verify_cache[tag] = time.time()
+                if len(self._verify_cache) > self._verify_cache_size:
+                    self._verify_cache.popitem(last=False)
+            return True
+        except Exception:
+            # Fixed message: don't leak details of the stored hash
+            logger.error("Error verifying password")
             return False
     
     def is_locked_out(self, username: str) -> bool:
         """Check if user is temporarily locked out"""
-        if username not in self.failed_attempts:
-            return False
-        
-        attempts = self.failed_attempts[username]
-        if len(attempts) < self.max_login_attempts:
-            return False
+        return self._lockout_remaining(username) > 0
+    
+    def _lockout_remaining(self, username: str) -> float:
+        """Seconds left in the user's lockout, 0 if not locked out"""
+        with self._lock:
+            attempts = self.failed_attempts.get(username)
+            if not attempts or len(attempts) < self.max_login_attempts:
+                return 0
+            
+            # All tracked attempts must fall within the lockout window
+            if attempts[-1] - attempts[0] > self.lockout_duration:
+                return 0
+            
+            # Check if lockout period has expired
+            remaining = self.lockout_duration - (time.time() - attempts[-1])
+            if remaining < 0:
+                # Reset attempts
+                attempts.clear()
+                return 0
+            
+            return remaining
+    
+    def _sweep_failed_attempts(self):
+        """
+        Drop expired entries so failed_attempts can't grow without bound.
+        Caller must hold self._lock
+        """
+        if len(self.failed_attempts) < self.max_tracked_users:
+            return
         
-        # Check if lockout period has expired
-        last_attempt = attempts[-1]
-        if time.time() - last_attempt > self.lockout_duration:
-            # Reset attempts
-            self.failed_attempts[username] = []
-            return False
+        now = time.time()
+        if now - self._last_sweep > 60:
+            self._last_sweep = now
+            expired = [
+                name for name, attempts in self.failed_attempts.items()
+                if not attempts or now - attempts[-1] > self.lockout_duration
+            ]
+            for name in expired:
+                del self.failed_attempts[name]
         
-        return True
+        # Still full: evict the least recently active users
+        while len(self.failed_attempts) >= self.max_tracked_users:
+            del self.failed_attempts[next(iter(self.failed_attempts))]
     
     def record_failed_attempt(self, username: str):
-        """Record a failed login attempt"""
-        if username not in self.failed_attempts:
-            self.failed_attempts[username] = []
-        self.failed_attempts[username].append(time.time())
-        
-        # Keep only recent attempts
-        cutoff = time.time() - self.lockout_duration
-        self.failed_attempts[username] = [
-            t for t in self.failed_attempts[username] if t > cutoff
-        ]
+        """
+        Record a failed login attempt
+        Returns: login attempts left before the account is locked out
+        """
+        with self._lock:
+            self._sweep_failed_attempts()
+            attempts = self.failed_attempts.setdefault(
+                username, deque(maxlen=self.max_login_attempts)
+            )
+            attempts.append(time.time())
+            self.failed_attempts.move_to_end(username)
+            return self.max_login_attempts - len(attempts)
     
     def clear_failed_attempts(self, username: str):
         """Clear failed login attempts for user"""
-        if username in self.failed_attempts:
-            self.failed_attempts[username] = []
+        with self._lock:
+            attempts = self.failed_attempts.get(username)
+            if attempts is not None:
+                attempts.clear()
     
     def login(self, username: str, password: str) -> tuple[bool, str, Optional[User]]:
         """
@@ -96,29 +217,42 @@ class AuthManager:
         """
         try:
             # Check if locked out
-            if self.is_locked_out(username):
-                remaining = self.lockout_duration - (time.time() - self.failed_attempts[username][-1])
+            remaining = self._lockout_remaining(username)
+            if remaining > 0:
                 return False, f"Account locked. Try again in {int(remaining/60)} minutes", None
             
             # Get user from database
             user_data = self.database.get_user_by_username(username)
             if not user_data:
+                # Still run bcrypt so the response time doesn't reveal
+                # whether the username exists
+                self.verify_password(password, self._dummy_hash)
                 self.record_failed_attempt(username)
                 return False, "Invalid username or password", None
             
+            # Verify password before any other check to keep timing uniform
+            password_ok = self.verify_password(password, user_data['password_hash'])
+            
             # Check if user is active
             if not user_data['is_active']:
                 return False, "Account is disabled", None
             
-            # Verify password
-            if not self.verify_password(password, user_data['password_hash']):
-                self.record_failed_attempt(username)
-                attempts_left = self.max_login_attempts - len(self.failed_attempts.get(username, []))
+            if not password_ok:
+                attempts_left = self.record_failed_attempt(username)
                 return False, f"Invalid username or password. {attempts_left} attempts remaining", None
             
             # Clear failed attempts on successful login
             self.clear_failed_attempts(username)
             
+            # Upgrade hashes created with a lower cost than the current one
+            if self._hash_rounds(user_data['password_hash']) < self._bcrypt_rounds:
+                self.database.update_user_password(user_data['id'], self.hash_password(password))
+                logger.info(f"Re-hashed password for user {username} with cost {self._bcrypt_rounds}")
+            
+            # Stamp last login; the same statement re-checks the account is still active
+            if self.database.login_user(username) is None:
+                return False, "Account is disabled", None
+            
             # Create user object
             user = User(
                 id=user_data['id'],
@@ -137,9 +271,6 @@ class AuthManager:
                 last_activity=time.time()
             )
             
-            # Update last login in database
-            self.database.update_last_login(user.id)
-            
             # Log successful login
             logger.info(f"User {username} logged in successfully")
             
@@ -149,6 +280,13 @@ class AuthManager:
             logger.error(f"Error during login: {e}")
             return False, "An error occurred during login", None
     
+    def login_async(self, username: str, password: str) -> Future:
+        """
+        Run login() on the shared bcrypt pool
+        Returns: Future resolving to (success, message, user)
+        """
+        return _BCRYPT_POOL.submit(self.login, username, password)
+    
     def logout(self):
         """Logout current user"""
         if self.current_session:
@@ -5,10 +5,48 @@ from dataclasses import dataclass
 from loguru import logger
 import time
 import threading
-import queue
+import struct
+from multiprocessing import shared_memory
+from concurrent.futures import ThreadPoolExecutor, as_completed
 import yaml
+import re
 from pathlib import Path
 
+# Whether this OpenCV build can open GStreamer pipelines
+_HAS_GSTREAMER = bool(re.search(r"GStreamer:\s*YES", cv2.getBuildInformation()))
+
+# Whether cv2.setNumThreads only affects the calling thread. With OpenMP the
+# thread count is per-thread state; every other backend (pthreads, TBB, ...)
+# has one process-wide pool that the capture threads must leave alone
+_PER_THREAD_CV_POOL = bool(re.search(r"Parallel framework:\s*OpenMP", cv2.getBuildInformation()))
+
+# libyaml-backed loader when available
+_YAML_LOADER = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+# cv2.rotate codes for each supported rotation
+_ROTATE_CODES = {
+    90: cv2.ROTATE_90_CLOCKWISE,
+    180: cv2.ROTATE_180,
+    270: cv2.ROTATE_90_COUNTERCLOCKWISE
+}
+
+# Number of reusable frame buffers per camera. A published frame stays
+# valid until this many more frames have been captured
+_FRAME_RING_SIZE = 3
+
+# Log every Nth consecutive read failure instead of each one
+_READ_FAILURE_LOG_EVERY = 5
+
+# Shared-memory frame layout: an int64 count of published frames followed by
+# two frame slots. Frame n is written to slot n % 2 before the count is set to
+# n, so a reader in any process finds new frames by polling the count (see
+# read_shared_frame); the writer only reuses a slot once the count has moved on
+_SHM_SEQ = struct.Struct('q')
+_SHM_HEADER_SIZE = _SHM_SEQ.size
+
+# GStreamer videoflip methods for each supported rotation
+_GST_FLIP_METHODS = {90: 'clockwise', 180: 'rotate-180', 270: 'counterclockwise'}
+
 @dataclass
 class CameraConfig:
     id: int
@@ -19,6 +57,56 @@ class CameraConfig:
     height: int
     fps: int
     rotate: int
+    threads: int = 1  # OpenCV threads for this camera's worker (OpenMP builds only)
+    shared_memory: bool = False  # Also publish frames to shared memory for other processes
+
+    def gstreamer_pipeline(self) -> Optional[str]:
+        """Build a GStreamer pipeline that rotates inside the decoder (RTSP/H.264 only)"""
+        method = _GST_FLIP_METHODS.get(self.rotate)
+        if method is None or not str(self.source).startswith('rtsp'):
+            return None
+        return (
+            f"rtspsrc location={self.source} latency=0 ! rtph264depay ! avdec_h264 ! "
+            f"videoflip method={method} ! videoconvert ! video/x-raw,format=BGR ! "
+            f"appsink drop=true max-buffers=1"
+        )
+
+@dataclass
+class SharedFrameBuffer:
+    """Double-buffered frame storage in shared memory, see _SHM_SEQ"""
+    shm: shared_memory.SharedMemory
+    shape: Tuple[int, int, int]
+
+    @property
+    def frame_size(self) -> int:
+        return self.shape[0] * self.shape[1] * self.shape[2]
+
+def _shared_slot(buf, shape: Tuple[int, int, int], seq: int) -> np.ndarray:
+    """View of the shared-memory slot that holds frame number seq"""
+    frame_size = shape[0] * shape[1] * shape[2]
+    return np.ndarray(shape, dtype=np.uint8, buffer=buf,
+                      offset=_SHM_HEADER_SIZE + (seq % 2) * frame_size)
+
+def read_shared_frame(shm: shared_memory.SharedMemory, shape: Tuple[int, int, int],
+                      last_seq: int = 0) -> Optional[Tuple[int, np.ndarray]]:
+    """
+    Copy the newest frame out of a camera's shared memory. Works from any
+    process: attach with shared_memory.SharedMemory(name) using the name and
+    shape from CameraManager.get_frame_shared, then poll with the returned
+    sequence number. Before Python 3.13 an attaching process must also call
+    resource_tracker.unregister(shm._name, 'shared_memory'), or the block
+    is unlinked when that process exits
+    Returns: (sequence number, frame) or None if nothing newer than last_seq
+    was published, or the frame was overwritten while being copied
+    """
+    seq = _SHM_SEQ.unpack_from(shm.buf, 0)[0]
+    if seq <= last_seq:
+        return None
+    
+    frame = _shared_slot(shm.buf, shape, seq).copy()
+    if _SHM_SEQ.unpack_from(shm.buf, 0)[0] != seq:
+        return None
+    return seq, frame
 
 class CameraManager:
     def __init__(self, config_path: str):
@@ -26,61 +114,74 @@ class CameraManager:
         self.capture_threads: Dict[int, threading.Thread] = {}
         self.capture_objects: Dict[int, cv2.VideoCapture] = {}
         self.stop_events: Dict[int, threading.Event] = {}
-        self.frame_queues: Dict[int, queue.Queue] = {}
-        self.thread_lock = threading.Lock()
+        # Latest-frame slot per camera; the event is set when the slot holds an unread frame
+        self.frame_slots: Dict[int, list] = {}
+        self.frame_events: Dict[int, threading.Event] = {}
+        self.shared_frames: Dict[int, SharedFrameBuffer] = {}
+        # Per-camera locks for start/stop work; the registry lock only guards dict membership
+        self._cam_locks: Dict[int, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+        self._rotate_code: Dict[int, Optional[int]] = {}
+        self._status_cache: Tuple[float, Optional[List[Dict]]] = (0.0, None)
+        self._status_cache_ttl = 0.1  # seconds
+        self._reach_cache: Dict[str, Tuple[float, bool]] = {}
+        self._reach_cache_ttl = 30.0  # seconds
         self.load_config(config_path)
 
     def _cleanup_camera_thread(self, cam_id: int, timeout: float = 5.0):
         """Clean up camera thread resources with improved timeout handling"""
         try:
-            with self.thread_lock:
+            with self._cam_locks.setdefault(cam_id, threading.Lock()):
                 # Signal thread to stop
                 if cam_id in self.stop_events:
                     self.stop_events[cam_id].set()
                 
                 # Wait for thread to finish with timeout
-                if cam_id in self.capture_threads:
-                    thread = self.capture_threads[cam_id]
-                    if thread.is_alive():
-                        logger.debug(f"Waiting for camera {cam_id} thread to stop...")
-                        thread.join(timeout=timeout)
-                        
-                        if thread.is_alive():
-                            logger.error(f"Camera {cam_id} thread did not stop within {timeout}s timeout")
-                            # Thread is still alive but we'll proceed with cleanup
-                        else:
-                            logger.debug(f"Camera {cam_id} thread stopped successfully")
+                thread = self.capture_threads.get(cam_id)
+                if thread is not None and thread.is_alive():
+                    logger.debug(f"Waiting for camera {cam_id} thread to stop...")
+                    thread.join(timeout=timeout)
                     
-                    del self.capture_threads[cam_id]
+                    if thread.is_alive():
+                        logger.error(f"Camera {cam_id} thread did not stop within {timeout}s timeout")
+                        # Thread is still alive but we'll proceed with cleanup
+                    else:
+                        logger.debug(f"Camera {cam_id} thread stopped successfully")
                 
                 # Close video capture object
-                if cam_id in self.capture_objects:
+                cap = self.capture_objects.get(cam_id)
+                if cap is not None:
                     try:
-                        cap = self.capture_objects[cam_id]
                         if cap.isOpened():
                             cap.release()
-                        del self.capture_objects[cam_id]
                         logger.debug(f"Released video capture for camera {cam_id}")
                     except Exception as e:
                         logger.error(f"Error releasing video capture for camera {cam_id}: {e}")
                 
-                # Clean up queue
-                if cam_id in self.frame_queues:
+                # Drop registry entries
+                with self._registry_lock:
+                    self.capture_threads.pop(cam_id, None)
+                    self.capture_objects.pop(cam_id, None)
+                    slot = self.frame_slots.pop(cam_id, None)
+                    event = self.frame_events.pop(cam_id, None)
+                    self.stop_events.pop(cam_id, None)
+                    shared = self.shared_frames.pop(cam_id, None)
+                    self._status_cache = (0.0, None)
+                
+                # Drop the pending frame in O(1) so readers holding the slot see nothing new
+                if event is not None:
+                    event.clear()
+                if slot is not None:
+                    slot[0] = None
+                
+                # Release shared memory
+                if shared is not None:
                     try:
-                        # Empty the queue
-                        while not self.frame_queues[cam_id].empty():
-                            try:
-                                self.frame_queues[cam_id].get_nowait()
-                            except queue.Empty:
-                                break
-                        del self.frame_queues[cam_id]
+                        shared.shm.close()
+                        shared.shm.unlink()
                     except Exception as e:
-                        logger.error(f"Error cleaning queue for camera {cam_id}: {e}")
+                        logger.error(f"Error releasing shared memory for camera {cam_id}: {e}")
                 
-                # Clean up stop event
-                if cam_id in self.stop_events:
-                    del self.stop_events[cam_id]
-                    
                 logger.info(f"Cleaned up resources for camera {cam_id}")
                 
         except Exception as e:
@@ -90,9 +191,10 @@ class CameraManager:
         """Load camera configuration from YAML file"""
         try:
             with open(config_path, 'r') as f:
-                config = yaml.safe_load(f)
+                config = yaml.load(f, Loader=_YAML_LOADER)
                 
             self.cameras.clear()
+            self._rotate_code.clear()
             for cam_config in config.get('cameras', []):
                 cam_id = cam_config['id']
                 self.cameras[cam_id] = CameraConfig(
@@ -103,8 +205,12 @@ class CameraManager:
                     width=cam_config['resolution']['width'],
                     height=cam_config['resolution']['height'],
                     fps=cam_config.get('fps', 30),
-                    rotate=cam_config.get('rotate', 0)
+                    rotate=cam_config.get('rotate', 0),
+                    threads=cam_config.get('threads', 1),
+                    shared_memory=cam_config.get('shared_memory', False)
                 )
+                self._rotate_code[cam_id] = _ROTATE_CODES.get(self.cameras[cam_id].rotate)
+                self._cam_locks.setdefault(cam_id, threading.Lock())
                 
             logger.info(f"Loaded {len(self.cameras)} camera configurations")
             
@@ -128,17 +234,25 @@ class CameraManager:
                     parsed = urlparse(source)
                     base_url = f"{parsed.scheme}://{parsed.netloc}"
                     
+                    # Reuse a recent probe result for the same host
+                    cached = self._reach_cache.get(base_url)
+                    if cached is not None and time.monotonic() - cached[0] < self._reach_cache_ttl:
+                        return cached[1]
+                    
                     # Quick HEAD request with short timeout
                     response = requests.head(base_url, timeout=3)
                     if response.status_code >= 400:
                         logger.warning(f"Camera {cam_id} returned status {response.status_code}")
+                        self._reach_cache[base_url] = (time.monotonic(), False)
                         return False
                     
                     logger.info(f"Network camera {cam_id} is reachable")
+                    self._reach_cache[base_url] = (time.monotonic(), True)
                     return True
                     
                 except requests.RequestException as e:
                     logger.warning(f"Camera {cam_id} validation failed: {e}")
+                    self._reach_cache[base_url] = (time.monotonic(), False)
                     return False
             
             # For local cameras (integer index)
@@ -152,15 +266,57 @@ class CameraManager:
             logger.error(f"Error validating camera {cam_id} source: {e}")
             return False
 
+    def _open_gpu_reader(self, cam_id: int, source):
+        """Open an NVDEC-backed reader for network sources, None if CUDA is unavailable"""
+        if not (isinstance(source, str) and source.startswith(('http', 'rtsp'))):
+            return None
+        if not hasattr(cv2, 'cudacodec'):
+            return None
+        
+        try:
+            if cv2.cuda.getCudaEnabledDeviceCount() == 0:
+                return None
+            reader = cv2.cudacodec.createVideoReader(source)
+            logger.info(f"Camera ID {cam_id} using GPU decoding")
+            return reader
+        except Exception as e:
+            logger.warning(f"GPU decoding unavailable for camera {cam_id}, using CPU: {e}")
+            return None
+
+    def _read_gpu_frame(self, reader, rotate: int) -> Tuple[bool, Optional[np.ndarray]]:
+        """Decode and rotate the next frame on the GPU, then download it"""
+        ret, gpu_frame = reader.nextFrame()
+        if not ret or gpu_frame is None:
+            return False, None
+        
+        # Rotate while still BGRA: cuda.transpose doesn't support 3-byte pixels
+        if rotate == 90:
+            gpu_frame = cv2.cuda.flip(cv2.cuda.transpose(gpu_frame), 1)
+        elif rotate == 180:
+            gpu_frame = cv2.cuda.flip(gpu_frame, -1)
+        elif rotate == 270:
+            gpu_frame = cv2.cuda.flip(cv2.cuda.transpose(gpu_frame), 0)
+        
+        gpu_frame = cv2.cuda.cvtColor(gpu_frame, cv2.COLOR_BGRA2BGR)
+        return True, gpu_frame.download()
+
     def start_all_cameras(self) -> None:
-        """Start all enabled cameras"""
-        for cam_id, cam_config in self.cameras.items():
-            if cam_config.enabled:
-                self.start_camera(cam_id)
+        """Start all enabled cameras (source validation runs in parallel)"""
+        cam_ids = [cam_id for cam_id, cam_config in self.cameras.items() if cam_config.enabled]
+        if not cam_ids:
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(32, len(cam_ids)), thread_name_prefix="CameraStart") as executor:
+            futures = {executor.submit(self.start_camera, cam_id): cam_id for cam_id in cam_ids}
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except Exception as e:
+                    logger.error(f"Error starting camera {futures[future]}: {e}")
 
     def stop_all_cameras(self) -> None:
         """Stop all camera threads"""
-        with self.thread_lock:
+        with self._registry_lock:
             cam_ids = list(self.capture_threads.keys())
         
         for cam_id in cam_ids:
@@ -192,9 +348,21 @@ class CameraManager:
         
         try:
             # Create new resources
-            self.frame_queues[cam_id] = queue.Queue(maxsize=2)
+            self.frame_slots[cam_id] = [None]
+            self.frame_events[cam_id] = threading.Event()
             self.stop_events[cam_id] = threading.Event()
             
+            if cam_config.shared_memory:
+                # Rotation by 90/270 swaps height and width
+                if cam_config.rotate in (90, 270):
+                    shape = (cam_config.width, cam_config.height, 3)
+                else:
+                    shape = (cam_config.height, cam_config.width, 3)
+                frame_size = shape[0] * shape[1] * shape[2]
+                shm = shared_memory.SharedMemory(create=True, size=_SHM_HEADER_SIZE + frame_size * 2)
+                _SHM_SEQ.pack_into(shm.buf, 0, 0)
+                self.shared_frames[cam_id] = SharedFrameBuffer(shm=shm, shape=shape)
+            
             # Create and start thread
             thread = threading.Thread(
                 target=self._capture_frames,
@@ -203,8 +371,9 @@ class CameraManager:
                 name=f"CameraThread-{cam_id}"
             )
             
-            with self.thread_lock:
+            with self._registry_lock:
                 self.capture_threads[cam_id] = thread
+                self._status_cache = (0.0, None)
             
             thread.start()
             logger.info(f"Started camera ID {cam_id}")
@@ -226,25 +395,42 @@ class CameraManager:
     def _capture_frames(self, cam_id: int) -> None:
         """Thread function to capture frames from a camera"""
         cam_config = self.cameras[cam_id]
+        stop_event = self.stop_events[cam_id]
         cap = None
         retry_count = 0
         max_retries = 3
         retry_delay = 2.0
         
+        # Keep this camera's OpenCV calls from fanning out across all cores,
+        # where the thread count can be set for this thread alone
+        if _PER_THREAD_CV_POOL:
+            cv2.setNumThreads(cam_config.threads)
+        
         try:
             # Handle different source types
             source = int(cam_config.source) if str(cam_config.source).isdigit() else cam_config.source
             
+            # Prefer hardware decoding for network streams
+            reader = self._open_gpu_reader(cam_id, source)
+            pipeline = cam_config.gstreamer_pipeline() if _HAS_GSTREAMER else None
+            
             # Try to open camera with retries
-            while retry_count < max_retries and not self.stop_events[cam_id].is_set():
+            while reader is None and retry_count < max_retries and not stop_event.is_set():
                 try:
-                    cap = cv2.VideoCapture(source)
+                    if pipeline is not None:
+                        cap = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+                        if not cap.isOpened():
+                            logger.warning(f"Camera {cam_id} GStreamer pipeline failed, using default backend")
+                            pipeline = None
+                            cap = cv2.VideoCapture(source)
+                    else:
+                        cap = cv2.VideoCapture(source)
                     
                     if not cap.isOpened():
                         raise RuntimeError(f"Failed to open camera source: {source}")
                     
                     # Store capture object for cleanup
-                    with self.thread_lock:
+                    with self._registry_lock:
                         self.capture_objects[cam_id] = cap
                     
                     # Set camera properties
@@ -267,21 +453,49 @@ class CameraManager:
                         logger.error(f"Failed to open camera ID {cam_id} after {max_retries} attempts")
                         return
             
-            if cap is None or not cap.isOpened():
+            if reader is None and (cap is None or not cap.isOpened()):
                 logger.error(f"Failed to open camera ID {cam_id} with source {cam_config.source}")
                 return
             
+            # Preallocated frame buffers, reused round-robin instead of
+            # allocating a new frame on every read
+            frame_ring = [
+                np.empty((cam_config.height, cam_config.width, 3), dtype=np.uint8)
+                for _ in range(_FRAME_RING_SIZE)
+            ]
+            rotate_ring = [None] * _FRAME_RING_SIZE
+            ring_idx = 0
+            
+            # Bind per-camera state once so the loop only touches locals.
+            # GPU and GStreamer frames are already rotated
+            slot = self.frame_slots[cam_id]
+            frame_event = self.frame_events[cam_id]
+            shared = self.shared_frames.get(cam_id)
+            publish_shared = self._publish_shared_frame
+            do_rotate = None
+            if reader is None and pipeline is None:
+                do_rotate = self._make_rotator(cam_config.rotate, self._rotate_code[cam_id], rotate_ring)
+            
             # Frame capture loop
             consecutive_failures = 0
             max_consecutive_failures = 10
             
-            while not self.stop_events[cam_id].is_set():
+            while not stop_event.is_set():
                 try:
-                    ret, frame = cap.read()
+                    if reader is not None:
+                        ret, frame = self._read_gpu_frame(reader, cam_config.rotate)
+                    elif not cap.grab():
+                        ret, frame = False, None
+                    else:
+                        ret, frame = cap.retrieve(frame_ring[ring_idx])
+                        if ret and frame is not None:
+                            # OpenCV reallocates if the real size differs from the config
+                            frame_ring[ring_idx] = frame
                     
                     if not ret or frame is None:
                         consecutive_failures += 1
-                        logger.warning(f"Camera ID {cam_id} read failed (attempt {consecutive_failures}/{max_consecutive_failures})")
+                        if consecutive_failures == 1 or consecutive_failures % _READ_FAILURE_LOG_EVERY == 0:
+                            logger.warning(f"Camera ID {cam_id} read failed (attempt {consecutive_failures}/{max_consecutive_failures})")
                         
                         if consecutive_failures >= max_consecutive_failures:
                             logger.error(f"Camera ID {cam_id} exceeded maximum consecutive failures")
@@ -293,30 +507,17 @@ class CameraManager:
                     # Reset failure counter on success
                     consecutive_failures = 0
                     
-                    # Apply rotation if needed
-                    if cam_config.rotate == 90:
-                        frame = cv2.rotate(frame, cv2.ROTATE_90_CLOCKWISE)
-                    elif cam_config.rotate == 180:
-                        frame = cv2.rotate(frame, cv2.ROTATE_180)
-                    elif cam_config.rotate == 270:
-                        frame = cv2.rotate(frame, cv2.ROTATE_90_COUNTERCLOCKWISE)
+                    if do_rotate is not None:
+                        frame = do_rotate(frame, ring_idx)
                     
-                    # Put frame in queue (non-blocking)
-                    if cam_id in self.frame_queues:
-                        # Remove old frame if queue is full
-                        if self.frame_queues[cam_id].full():
-                            try:
-                                self.frame_queues[cam_id].get_nowait()
-                            except queue.Empty:
-                                pass
-                        
-                        try:
-                            self.frame_queues[cam_id].put(frame, block=False)
-                        except queue.Full:
-                            pass  # Frame dropped, continue to next
+                    # Publish latest frame, replacing any unread one
+                    slot[0] = frame
+                    frame_event.set()
+                    
+                    if shared is not None:
+                        publish_shared(cam_id, shared, frame)
                     
-                    # Small delay to prevent CPU overload
-                    time.sleep(0.001)
+                    ring_idx = (ring_idx + 1) % _FRAME_RING_SIZE
                     
                 except Exception as e:
                     logger.error(f"Error in camera ID {cam_id} capture loop: {e}")
@@ -339,23 +540,69 @@ class CameraManager:
             
             logger.info(f"Camera ID {cam_id} capture thread exiting")
 
+    @staticmethod
+    def _make_rotator(rotate: int, code: Optional[int], rotate_ring: list):
+        """Build the rotation step for a camera, or None if frames need no rotation"""
+        if rotate == 180:
+            # Reversed view instead of a full copy; consumers make
+            # it contiguous only when they need to
+            return lambda frame, ring_idx: frame[::-1, ::-1]
+        
+        if code is None:
+            return None
+        
+        def rotate_frame(frame: np.ndarray, ring_idx: int) -> np.ndarray:
+            frame = cv2.rotate(frame, code, rotate_ring[ring_idx])
+            rotate_ring[ring_idx] = frame
+            return frame
+        
+        return rotate_frame
+
+    def _publish_shared_frame(self, cam_id: int, shared: SharedFrameBuffer, frame: np.ndarray) -> None:
+        """Copy a frame into the idle shared-memory slot, then bump the sequence number"""
+        if frame.shape != shared.shape:
+            logger.warning(f"Camera ID {cam_id} frame shape {frame.shape} does not match shared buffer {shared.shape}")
+            return
+        
+        buf = shared.shm.buf
+        seq = _SHM_SEQ.unpack_from(buf, 0)[0] + 1
+        target = _shared_slot(buf, shared.shape, seq)
+        target[...] = frame
+        # Release the view before publishing; shm.close() fails while one is alive
+        del target
+        _SHM_SEQ.pack_into(buf, 0, seq)
+
+    def get_frame_shared(self, cam_id: int) -> Optional[Tuple[str, Tuple[int, int, int]]]:
+        """
+        Locate a camera's frames in shared memory, for read_shared_frame
+        Returns: (shm_name, shape) or None if not shared
+        """
+        shared = self.shared_frames.get(cam_id)
+        if shared is None:
+            return None
+        return shared.shm.name, shared.shape
+
     def get_frame(self, cam_id: int) -> Optional[np.ndarray]:
         """Get the latest frame from a camera"""
-        if cam_id not in self.frame_queues:
-            return None
-            
-        try:
-            return self.frame_queues[cam_id].get_nowait()
-        except queue.Empty:
+        event = self.frame_events.get(cam_id)
+        if event is None or not event.is_set():
             return None
+        
+        event.clear()
+        return self.frame_slots[cam_id][0]
 
     def get_all_frames(self) -> Dict[int, np.ndarray]:
         """Get latest frames from all cameras"""
         frames = {}
-        for cam_id in list(self.frame_queues.keys()):
-            frame = self.get_frame(cam_id)
-            if frame is not None:
-                frames[cam_id] = frame
+        for cam_id, event in list(self.frame_events.items()):
+            if not event.is_set():
+                continue
+            slot = self.frame_slots.get(cam_id)
+            if slot is None:
+                continue
+            event.clear()
+            if slot[0] is not None:
+                frames[cam_id] = slot[0]
         return frames
 
     def get_camera_status(self, cam_id: int) -> Dict:
@@ -363,22 +610,38 @@ class CameraManager:
         if cam_id not in self.cameras:
             return {}
         
-        with self.thread_lock:
-            is_running = cam_id in self.capture_threads and self.capture_threads[cam_id].is_alive()
-            
-        status = {
-            'id': cam_id,
-            'name': self.cameras[cam_id].name,
-            'running': is_running,
-            'frame_queue_size': self.frame_queues[cam_id].qsize() if cam_id in self.frame_queues else 0,
-            'enabled': self.cameras[cam_id].enabled,
-            'source': self.cameras[cam_id].source
-        }
-        return status
+        for status in self.get_all_camera_status():
+            if status['id'] == cam_id:
+                return status
+        return {}
 
     def get_all_camera_status(self) -> List[Dict]:
-        """Get status for all cameras"""
-        return [self.get_camera_status(cam_id) for cam_id in self.cameras]
+        """
+        Get status for all cameras (cached for a short TTL)
+        Returns: fresh dicts on every call, so callers may modify them
+        """
+        now = time.monotonic()
+        cached_at, cached = self._status_cache
+        if cached is not None and now - cached_at < self._status_cache_ttl:
+            return [status.copy() for status in cached]
+        
+        # Lock-free snapshot: copying the dict is atomic under the GIL
+        running = {cam_id: thread.is_alive() for cam_id, thread in list(self.capture_threads.items())}
+        
+        statuses = []
+        for cam_id, cam_config in self.cameras.items():
+            event = self.frame_events.get(cam_id)
+            statuses.append({
+                'id': cam_id,
+                'name': cam_config.name,
+                'running': running.get(cam_id, False),
+                'frame_queue_size': 1 if event is not None and event.is_set() else 0,
+                'enabled': cam_config.enabled,
+                'source': cam_config.source
+            })
+        
+        self._status_cache = (now, statuses)
+        return [status.copy() for status in statuses]
 
     def __del__(self):
         """Destructor to ensure all cameras are stopped"""
@@ -1,10 +1,245 @@
 import sqlite3
+import numpy as np
 from dataclasses import dataclass
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple, Iterator
 from pathlib import Path
+from contextlib import contextmanager
+from functools import lru_cache
 from loguru import logger
+import atexit
+import queue
+import threading
 import time
 
+# Applied to every connection. WAL lets readers run alongside the writer and
+# synchronous=NORMAL only fsyncs at checkpoints instead of on every commit
+_CONNECTION_PRAGMAS = '''
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA mmap_size = 268435456;
+    PRAGMA cache_size = -65536;
+    PRAGMA busy_timeout = 5000;
+'''
+
+# Seconds between background PRAGMA optimize runs
+_OPTIMIZE_INTERVAL = 15 * 60
+
+# Face-log rows are queued and committed by a background writer, up to
+# _WRITE_BATCH_SIZE rows or _WRITE_BATCH_WAIT seconds per transaction. A full
+# queue blocks the caller for up to _WRITE_QUEUE_TIMEOUT seconds before the row
+# is dropped and counted. Audit rows are written synchronously so none is dropped
+_WRITE_QUEUE_SIZE = 8192
+_WRITE_QUEUE_TIMEOUT = 0.25
+_WRITE_BATCH_SIZE = 500
+_WRITE_BATCH_WAIT = 0.1
+
+# Writer-only WAL limits: checkpoint every ~1000 pages and truncate the -wal
+# file back to 64 MiB afterwards; the writer also forces a TRUNCATE checkpoint
+# once the queue drains if _CHECKPOINT_INTERVAL seconds have passed
+_WAL_PRAGMAS = '''
+    PRAGMA journal_size_limit = 67108864;
+    PRAGMA wal_autocheckpoint = 1000;
+'''
+_CHECKPOINT_INTERVAL = 60
+
+# Bumped whenever _init_db gains a migration or _SCHEMA_INDEXES changes; stored
+# in PRAGMA user_version. A database already at this version skips the schema
+# script, migrations and index creation on open
+CURRENT_SCHEMA_VERSION = 5
+
+# Schema, applied with one executescript each. Indexes are created after
+# the migrations so they never reference a column that is still missing
+_SCHEMA_TABLES = '''
+    BEGIN;
+    
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        username TEXT NOT NULL UNIQUE,
+        email TEXT NOT NULL UNIQUE,
+        password_hash TEXT NOT NULL,
+        role TEXT NOT NULL DEFAULT 'viewer',
+        is_active BOOLEAN NOT NULL DEFAULT 1,
+        created_at REAL NOT NULL,
+        last_login REAL,
+        created_by INTEGER,
+        FOREIGN KEY (created_by) REFERENCES users(id)
+    );
+    
+    CREATE TABLE IF NOT EXISTS face_logs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp REAL NOT NULL,
+        camera_id INTEGER NOT NULL,
+        camera_name TEXT NOT NULL,
+        face_name TEXT NOT NULL,
+        age INTEGER,
+        gender TEXT,
+        confidence REAL NOT NULL,
+        screenshot_path TEXT,
+        user_id INTEGER,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    );
+    
+    CREATE TABLE IF NOT EXISTS known_faces (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        lastname TEXT,
+        age INTEGER,
+        cedula TEXT UNIQUE,
+        birth_date TEXT,
+        crime TEXT,
+        case_number TEXT,
+        embedding BLOB NOT NULL,
+        image_path TEXT NOT NULL,
+        created_at REAL NOT NULL,
+        created_by INTEGER,
+        FOREIGN KEY (created_by) REFERENCES users(id)
+    );
+    
+    -- Single-row counter bumped by every change to known_faces, including
+    -- writes that bypass FaceDatabase; saved galleries are keyed on it
+    CREATE TABLE IF NOT EXISTS known_faces_state (
+        id INTEGER PRIMARY KEY CHECK (id = 1),
+        version INTEGER NOT NULL
+    );
+    INSERT OR IGNORE INTO known_faces_state (id, version) VALUES (1, 0);
+    
+    CREATE TRIGGER IF NOT EXISTS trg_known_faces_insert AFTER INSERT ON known_faces
+    BEGIN UPDATE known_faces_state SET version = version + 1; END;
+    CREATE TRIGGER IF NOT EXISTS trg_known_faces_update AFTER UPDATE ON known_faces
+    BEGIN UPDATE known_faces_state SET version = version + 1; END;
+    CREATE TRIGGER IF NOT EXISTS trg_known_faces_delete AFTER DELETE ON known_faces
+    BEGIN UPDATE known_faces_state SET version = version + 1; END;
+    
+    CREATE TABLE IF NOT EXISTS audit_log (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        timestamp REAL NOT NULL,
+        user_id INTEGER NOT NULL,
+        action TEXT NOT NULL,
+        details TEXT,
+        FOREIGN KEY (user_id) REFERENCES users(id)
+    );
+    
+    COMMIT;
+'''
+
+# The composite (filter, timestamp DESC) indexes answer a camera, name or
+# user filter plus ORDER BY timestamp DESC LIMIT from one range scan; they
+# replace the old single-column camera_id/face_name indexes
+_SCHEMA_INDEXES = '''
+    BEGIN;
+    
+    CREATE INDEX IF NOT EXISTS idx_face_logs_timestamp ON face_logs(timestamp);
+    CREATE INDEX IF NOT EXISTS idx_face_logs_user_id ON face_logs(user_id);
+    CREATE INDEX IF NOT EXISTS idx_known_faces_cedula ON known_faces(cedula);
+    CREATE INDEX IF NOT EXISTS idx_known_faces_case_number ON known_faces(case_number);
+    
+    DROP INDEX IF EXISTS idx_face_logs_camera_id;
+    DROP INDEX IF EXISTS idx_face_logs_face_name;
+    CREATE INDEX IF NOT EXISTS idx_face_logs_camera_ts ON face_logs(camera_id, timestamp DESC, id DESC);
+    CREATE INDEX IF NOT EXISTS idx_face_logs_name_ts ON face_logs(face_name, timestamp DESC, id DESC);
+    
+    CREATE INDEX IF NOT EXISTS idx_audit_user_ts ON audit_log(user_id, timestamp DESC);
+    CREATE INDEX IF NOT EXISTS idx_audit_ts ON audit_log(timestamp DESC);
+    
+    COMMIT;
+'''
+
+# Statement text is kept constant so the connection's prepared-statement
+# cache can reuse the compiled program across calls
+_STATEMENT_CACHE_SIZE = 256
+
+_INSERT_USER = '''
+    INSERT INTO users (username, email, password_hash, role, created_at, created_by)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+_SELECT_USER_BY_USERNAME = "SELECT * FROM users WHERE username = ?"
+
+_SELECT_USER_BY_ID = "SELECT * FROM users WHERE id = ?"
+
+_SELECT_ALL_USERS = '''
+    SELECT id, username, email, role, is_active, created_at, last_login
+    FROM users
+    ORDER BY username
+'''
+
+_UPDATE_USER_PASSWORD = "UPDATE users SET password_hash = ? WHERE id = ? RETURNING id"
+
+_UPDATE_LAST_LOGIN = "UPDATE users SET last_login = ? WHERE id = ? RETURNING id"
+
+# Looked up through the UNIQUE index on username
+_LOGIN_USER = "UPDATE users SET last_login = ? WHERE username = ? AND is_active = 1 RETURNING *"
+
+# Columns update_user may change
+_USER_UPDATE_FIELDS = frozenset(('email', 'role', 'is_active'))
+
+_DEACTIVATE_USER = "UPDATE users SET is_active = 0 WHERE id = ? RETURNING id"
+
+_SELECT_AUDIT_LOGS = '''
+    SELECT a.*, u.username 
+    FROM audit_log a
+    JOIN users u ON a.user_id = u.id
+    ORDER BY a.timestamp DESC
+    LIMIT ?
+'''
+
+_SELECT_AUDIT_LOGS_BY_USER = '''
+    SELECT a.*, u.username 
+    FROM audit_log a
+    JOIN users u ON a.user_id = u.id
+    WHERE a.user_id = ?
+    ORDER BY a.timestamp DESC
+    LIMIT ?
+'''
+
+# Rows fetched per round trip when streaming face logs
+_FACE_LOG_ARRAYSIZE = 1000
+
+_SELECT_FACE_LOGS = '''
+    SELECT id, timestamp, camera_id, camera_name, face_name, 
+           age, gender, confidence, screenshot_path, user_id
+    FROM face_logs
+'''
+
+_INSERT_KNOWN_FACE = '''
+    INSERT INTO known_faces (name, lastname, age, cedula, birth_date, 
+                            crime, case_number, embedding, image_path, 
+                            created_at, created_by)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SELECT_KNOWN_FACES = '''
+    SELECT id, name, lastname, age, cedula, birth_date, crime, 
+           case_number, embedding, image_path 
+    FROM known_faces
+    ORDER BY id
+'''
+
+_SELECT_KNOWN_FACES_METADATA = '''
+    SELECT id, name, lastname, age, cedula, birth_date, crime, 
+           case_number, image_path 
+    FROM known_faces
+    ORDER BY id
+'''
+
+_SELECT_KNOWN_FACE_EMBEDDINGS = "SELECT id, embedding FROM known_faces ORDER BY id"
+
+_DELETE_KNOWN_FACE = "DELETE FROM known_faces WHERE cedula = ?"
+
+_SELECT_KNOWN_FACES_VERSION = "SELECT version FROM known_faces_state"
+
+_INSERT_FACE_LOG = '''
+    INSERT INTO face_logs (
+        timestamp, camera_id, camera_name, face_name,
+        age, gender, confidence, screenshot_path, user_id
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_INSERT_AUDIT_LOG = '''
+    INSERT INTO audit_log (timestamp, user_id, action, details)
+    VALUES (?, ?, ?, ?)
+'''
+
 @dataclass
 class FaceLogEntry:
     id: int
@@ -24,171 +259,292 @@ class FaceLogEntry:
         elif isinstance(self.timestamp, str):
             self.timestamp = float(self.timestamp)
 
+@lru_cache(maxsize=32)
+def _update_user_sql(fields: tuple) -> str:
+    """UPDATE statement for one combination of user fields"""
+    set_clause = ', '.join(f"{k} = ?" for k in fields)
+    return f"UPDATE users SET {set_clause} WHERE id = ?"
+
 class FaceDatabase:
     def __init__(self, db_path: str):
         self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        
+        # One long-lived writer connection in autocommit mode, serialized by
+        # a lock, plus a read-only connection per reading thread (_read_conn)
+        self._write_lock = threading.RLock()
+        
+        # (known_faces version, embeddings, ids) from get_known_faces_matrix
+        self._embedding_cache: Optional[Tuple[int, np.ndarray, List[int]]] = None
+        self._embedding_cache_lock = threading.Lock()
+        
+        self._conn = self._connect(str(self.db_path))
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.executescript(_WAL_PRAGMAS)
         self._init_db()
+        self._read_uri = f"{self.db_path.resolve().as_uri()}?mode=ro"
+        self._read_local = threading.local()
+        # Every read connection opened so far, closed together by close()
+        self._read_conns: List[sqlite3.Connection] = []
+        self._read_conns_lock = threading.Lock()
+        
+        self._closed = False
+        self._write_queue = queue.Queue(maxsize=_WRITE_QUEUE_SIZE)
+        # Rows _enqueue_write gave up on because the writer fell behind
+        self.dropped_writes = 0
+        self._dropped_lock = threading.Lock()
+        self._writer_thread = threading.Thread(
+            target=self._drain_writes,
+            daemon=True,
+            name="DatabaseWriter"
+        )
+        self._writer_thread.start()
+        self._schedule_optimize()
+        atexit.register(self.close)
+
+    @staticmethod
+    def _connect(database: str, uri: bool = False) -> sqlite3.Connection:
+        """Open a connection shared across threads with the tuned PRAGMAs applied"""
+        conn = sqlite3.connect(database, uri=uri, check_same_thread=False, isolation_level=None,
+                               cached_statements=_STATEMENT_CACHE_SIZE)
+        conn.executescript(_CONNECTION_PRAGMAS)
+        return conn
+
+    @property
+    def _read_conn(self) -> sqlite3.Connection:
+        """
+        This thread's read-only connection, opened on first use. A sqlite3
+        connection is not safe to query from several threads at once
+        """
+        conn = getattr(self._read_local, 'conn', None)
+        if conn is None:
+            conn = self._connect(self._read_uri, uri=True)
+            self._read_local.conn = conn
+            with self._read_conns_lock:
+                self._read_conns.append(conn)
+        return conn
+
+    def _schedule_optimize(self) -> None:
+        """Arm the timer for the next background PRAGMA optimize"""
+        self._optimize_timer = threading.Timer(_OPTIMIZE_INTERVAL, self._periodic_optimize)
+        self._optimize_timer.daemon = True
+        self._optimize_timer.start()
+
+    def _periodic_optimize(self) -> None:
+        """Let SQLite refresh stale planner statistics, then reschedule"""
+        with self._write_lock:
+            if self._closed:
+                return
+            try:
+                self._conn.execute("PRAGMA optimize")
+            except Exception as e:
+                logger.error(f"Error optimizing database: {e}")
+            self._schedule_optimize()
+
+    def _drain_writes(self) -> None:
+        """Background writer: commit queued rows in batches until close() sends None"""
+        stopping = False
+        last_checkpoint = time.monotonic()
+        while not stopping:
+            batch = [self._write_queue.get()]
+            deadline = time.monotonic() + _WRITE_BATCH_WAIT
+            while len(batch) < _WRITE_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._write_queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            
+            stopping = None in batch
+            rows = [item for item in batch if item is not None]
+            if rows:
+                self._write_batch(rows)
+            for _ in batch:
+                self._write_queue.task_done()
+            
+            if self._write_queue.empty() and time.monotonic() - last_checkpoint >= _CHECKPOINT_INTERVAL:
+                self.checkpoint()
+                last_checkpoint = time.monotonic()
+
+    def _write_batch(self, rows: List[tuple]) -> None:
+        """Insert queued (sql, params) rows in a single transaction"""
+        grouped: Dict[str, list] = {}
+        for sql, params in rows:
+            grouped.setdefault(sql, []).append(params)
+        
+        try:
+            with self._write_tx() as cursor:
+                for sql, params in grouped.items():
+                    cursor.executemany(sql, params)
+        except Exception as e:
+            logger.error(f"Error writing {len(rows)} queued rows: {e}")
+
+    @contextmanager
+    def _write_tx(self):
+        """
+        Write transaction on the shared connection. BEGIN IMMEDIATE takes the
+        write lock up front instead of upgrading mid-transaction, which can
+        fail with SQLITE_BUSY when another process is writing
+        """
+        with self._write_lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield self._conn.cursor()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                if self._conn.in_transaction:
+                    self._conn.rollback()
+                raise
+
+    def _enqueue_write(self, sql: str, params: tuple) -> None:
+        """
+        Hand a row to the background writer, waiting up to _WRITE_QUEUE_TIMEOUT
+        for room; a row that still does not fit is dropped and counted
+        """
+        try:
+            self._write_queue.put((sql, params), timeout=_WRITE_QUEUE_TIMEOUT)
+        except queue.Full:
+            with self._dropped_lock:
+                self.dropped_writes += 1
+                dropped = self.dropped_writes
+            logger.warning(f"Database write queue is full, dropped row ({dropped} dropped so far)")
+
+    def flush(self) -> None:
+        """Block until every queued row has been committed"""
+        self._write_queue.join()
+
+    def checkpoint(self) -> None:
+        """Copy the WAL back into the database and truncate the -wal file"""
+        with self._write_lock:
+            try:
+                self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            except Exception as e:
+                logger.error(f"Error checkpointing database: {e}")
+    
+    def close(self) -> None:
+        """Flush queued rows, run a final PRAGMA optimize and close the connections"""
+        with self._write_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._optimize_timer.cancel()
+        
+        # The writer needs the lock to commit, so stop it before taking it again
+        self._write_queue.put(None)
+        self._writer_thread.join()
+        
+        with self._write_lock:
+            try:
+                self._conn.execute("PRAGMA optimize")
+            except Exception as e:
+                logger.error(f"Error optimizing database: {e}")
+            
+            with self._read_conns_lock:
+                for conn in self._read_conns:
+                    conn.close()
+                self._read_conns.clear()
+            self._conn.close()
+
+    @staticmethod
+    def _fetch_dicts(cursor: sqlite3.Cursor) -> List[Dict]:
+        """Build row dicts from one column-name tuple instead of sqlite3.Row objects"""
+        cols = tuple(d[0] for d in cursor.description)
+        return [dict(zip(cols, row)) for row in cursor.fetchall()]
 
     def _init_db(self) -> None:
         """Initialize the database with required tables and handle migrations"""
         try:
-            self.db_path.parent.mkdir(parents=True, exist_ok=True)
-            
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
+            with self._write_lock:
+                cursor = self._conn.cursor()
                 
-                # Create users table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS users (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        username TEXT NOT NULL UNIQUE,
-                        email TEXT NOT NULL UNIQUE,
-                        password_hash TEXT NOT NULL,
-                        role TEXT NOT NULL DEFAULT 'viewer',
-                        is_active BOOLEAN NOT NULL DEFAULT 1,
-                        created_at REAL NOT NULL,
-                        last_login REAL,
-                        created_by INTEGER,
-                        FOREIGN KEY (created_by) REFERENCES users(id)
-                    )
-                ''')
-                
-                # Create face_logs table with user_id
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS face_logs (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp REAL NOT NULL,
-                        camera_id INTEGER NOT NULL,
-                        camera_name TEXT NOT NULL,
-                        face_name TEXT NOT NULL,
-                        age INTEGER,
-                        gender TEXT,
-                        confidence REAL NOT NULL,
-                        screenshot_path TEXT,
-                        user_id INTEGER,
-                        FOREIGN KEY (user_id) REFERENCES users(id)
-                    )
-                ''')
+                # Fast path: schema already current, nothing to create or migrate
+                schema_version = cursor.execute("SELECT user_version FROM pragma_user_version").fetchone()[0]
+                if schema_version == CURRENT_SCHEMA_VERSION and cursor.execute(
+                        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'users'").fetchone():
+                    # Startup maintenance still runs: fold a WAL left by the
+                    # last session back in and refresh stale statistics
+                    self.checkpoint()
+                    cursor.execute("PRAGMA optimize")
+                    logger.success("Database initialized successfully")
+                    return
                 
-                # Create known_faces table with new columns
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS known_faces (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        name TEXT NOT NULL,
-                        lastname TEXT,
-                        age INTEGER,
-                        cedula TEXT UNIQUE,
-                        birth_date TEXT,
-                        crime TEXT,
-                        case_number TEXT,
-                        embedding BLOB NOT NULL,
-                        image_path TEXT NOT NULL,
-                        created_at REAL NOT NULL,
-                        created_by INTEGER,
-                        FOREIGN KEY (created_by) REFERENCES users(id)
-                    )
-                ''')
+                # Create tables in one script
+                cursor.executescript(_SCHEMA_TABLES)
                 
-                # Create audit_log table
-                cursor.execute('''
-                    CREATE TABLE IF NOT EXISTS audit_log (
-                        id INTEGER PRIMARY KEY AUTOINCREMENT,
-                        timestamp REAL NOT NULL,
-                        user_id INTEGER NOT NULL,
-                        action TEXT NOT NULL,
-                        details TEXT,
-                        FOREIGN KEY (user_id) REFERENCES users(id)
-                    )
-                ''')
+                cursor.execute("BEGIN IMMEDIATE")
                 
                 # ====== MIGRATION SECTION ======
-                # Check and add missing columns to known_faces
-                cursor.execute("PRAGMA table_info(known_faces)")
-                columns = [row[1] for row in cursor.fetchall()]
-                
-                required_columns = {
-                    'lastname': 'TEXT',
-                    'age': 'INTEGER',
-                    'cedula': 'TEXT',
-                    'birth_date': 'TEXT',
-                    'crime': 'TEXT',
-                    'case_number': 'TEXT'
-                }
-                
-                for col_name, col_type in required_columns.items():
-                    if col_name not in columns:
-                        logger.warning(f"Migrating known_faces table: adding {col_name} column")
-                        try:
-                            cursor.execute(f'ALTER TABLE known_faces ADD COLUMN {col_name} {col_type}')
-                            logger.info(f"✅ Column {col_name} added successfully")
-                        except sqlite3.OperationalError as e:
-                            logger.error(f"Migration failed for {col_name}: {e}")
-                
-                # Ensure cedula has values (migrate existing records)
-                cursor.execute("SELECT COUNT(*) FROM known_faces WHERE cedula IS NULL OR cedula = ''")
-                result = cursor.fetchone()
-                null_count = result[0] if result else 0
-                
-                if null_count > 0:
-                    logger.warning(f"Populating {null_count} records with default cedula values")
-                    cursor.execute('''
-                        UPDATE known_faces 
-                        SET cedula = 'UNKNOWN_' || id
-                        WHERE cedula IS NULL OR cedula = ''
-                    ''')
-                    logger.info(f"✅ Updated {null_count} records")
-                
-                # Create indexes for better performance
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_face_logs_timestamp 
-                    ON face_logs(timestamp)
-                ''')
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_face_logs_camera_id 
-                    ON face_logs(camera_id)
-                ''')
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_face_logs_face_name 
-                    ON face_logs(face_name)
-                ''')
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_face_logs_user_id 
-                    ON face_logs(user_id)
-                ''')
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_known_faces_cedula 
-                    ON known_faces(cedula)
-                ''')
-                cursor.execute('''
-                    CREATE INDEX IF NOT EXISTS idx_known_faces_case_number 
-                    ON known_faces(case_number)
-                ''')
+                # Skipped entirely once user_version says the schema is current
+                cursor.execute("PRAGMA user_version")
+                schema_version = cursor.fetchone()[0]
                 
-                # Check if user_id column exists in face_logs (MIGRATION)
-                cursor.execute("PRAGMA table_info(face_logs)")
-                face_logs_columns = [row[1] for row in cursor.fetchall()]
-                
-                if 'user_id' not in face_logs_columns:
-                    logger.warning("Migrating face_logs table: adding user_id column")
-                    try:
+                if schema_version < CURRENT_SCHEMA_VERSION:
+                    # Check and add missing columns to known_faces
+                    cursor.execute("PRAGMA table_info(known_faces)")
+                    columns = [row[1] for row in cursor.fetchall()]
+                    
+                    required_columns = {
+                        'lastname': 'TEXT',
+                        'age': 'INTEGER',
+                        'cedula': 'TEXT',
+                        'birth_date': 'TEXT',
+                        'crime': 'TEXT',
+                        'case_number': 'TEXT'
+                    }
+                    
+                    for col_name, col_type in required_columns.items():
+                        if col_name not in columns:
+                            logger.warning(f"Migrating known_faces table: adding {col_name} column")
+                            try:
+                                cursor.execute(f'ALTER TABLE known_faces ADD COLUMN {col_name} {col_type}')
+                                logger.info(f"✅ Column {col_name} added successfully")
+                            except sqlite3.OperationalError as e:
+                                logger.error(f"Migration failed for {col_name}: {e}")
+                    
+                    # Ensure cedula has values (migrate existing records)
+                    cursor.execute("SELECT COUNT(*) FROM known_faces WHERE cedula IS NULL OR cedula = ''")
+                    result = cursor.fetchone()
+                    null_count = result[0] if result else 0
+                    
+                    if null_count > 0:
+                        logger.warning(f"Populating {null_count} records with default cedula values")
                         cursor.execute('''
-                            ALTER TABLE face_logs 
-                            ADD COLUMN user_id INTEGER REFERENCES users(id)
+                            UPDATE known_faces 
+                            SET cedula = 'UNKNOWN_' || id
+                            WHERE cedula IS NULL OR cedula = ''
                         ''')
-                        logger.info("✅ Column user_id added to face_logs")
-                    except sqlite3.OperationalError as e:
-                        logger.error(f"Migration failed: {e}")
+                        logger.info(f"✅ Updated {null_count} records")
+                    
+                    # Check if user_id column exists in face_logs (MIGRATION)
+                    cursor.execute("PRAGMA table_info(face_logs)")
+                    face_logs_columns = [row[1] for row in cursor.fetchall()]
+                    
+                    if 'user_id' not in face_logs_columns:
+                        logger.warning("Migrating face_logs table: adding user_id column")
+                        try:
+                            cursor.execute('''
+                                ALTER TABLE face_logs 
+                                ADD COLUMN user_id INTEGER REFERENCES users(id)
+                            ''')
+                            logger.info("✅ Column user_id added to face_logs")
+                        except sqlite3.OperationalError as e:
+                            logger.error(f"Migration failed: {e}")
+                    
+                    cursor.execute(f"PRAGMA user_version = {CURRENT_SCHEMA_VERSION}")
                 
                 # Create default admin user if no users exist
                 cursor.execute('SELECT COUNT(*) FROM users')
                 if cursor.fetchone()[0] == 0:
                     import bcrypt
                     import secrets
-                    import string
                     
-                    random_password = ''.join(secrets.choice(string.ascii_letters + string.digits) for _ in range(16))
+                    random_password = secrets.token_urlsafe(12)
                     
-                    salt = bcrypt.gensalt()
+                    # Low cost keeps startup fast; AuthManager re-hashes at its
+                    # calibrated cost on the first successful login
+                    salt = bcrypt.gensalt(rounds=10)
                     hashed = bcrypt.hashpw(random_password.encode('utf-8'), salt)
                     
                     cursor.execute('''
@@ -211,10 +567,24 @@ class FaceDatabase:
                         f.write("\nDELETE THIS FILE AFTER FIRST LOGIN AND PASSWORD CHANGE!\n")
                     logger.info(f"Credentials saved to: {credentials_file}")
                 
-                conn.commit()
+                cursor.execute("COMMIT")
+                
+                # Create indexes once migrated columns exist
+                cursor.execute('''
+                    SELECT COUNT(*) FROM sqlite_master
+                    WHERE type = 'index' AND name IN ('idx_face_logs_camera_ts', 'idx_face_logs_name_ts')
+                ''')
+                needs_analyze = cursor.fetchone()[0] < 2
+                cursor.executescript(_SCHEMA_INDEXES)
+                if needs_analyze:
+                    cursor.execute('ANALYZE face_logs')
+                
+                cursor.execute("PRAGMA optimize")
                 logger.success("Database initialized successfully")
                 
         except Exception as e:
+            if self._conn.in_transaction:
+                self._conn.rollback()
             logger.error(f"Error initializing database: {e}")
             raise
 
@@ -224,18 +594,13 @@ class FaceDatabase:
                    role: str = 'viewer', created_by: Optional[int] = None) -> Optional[int]:
         """Create a new user"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO users (username, email, password_hash, role, created_at, created_by)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                ''', (username, email, password_hash, role, time.time(), created_by))
-                conn.commit()
+            with self._write_tx() as cursor:
+                cursor.execute(_INSERT_USER, (username, email, password_hash, role, time.time(), created_by))
                 user_id = cursor.lastrowid
                 
-                # Log audit
+                # Log audit in the same transaction
                 if created_by:
-                    self.log_audit(created_by, 'create_user', f"Created user: {username}")
+                    self._log_audit(cursor, created_by, 'create_user', f"Created user: {username}")
                 
                 return user_id
         except sqlite3.IntegrityError as e:
@@ -248,14 +613,10 @@ class FaceDatabase:
     def get_user_by_username(self, username: str) -> Optional[Dict]:
         """Get user by username"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT * FROM users WHERE username = ?
-                ''', (username,))
-                row = cursor.fetchone()
-                return dict(row) if row else None
+            cursor = self._read_conn.cursor()
+            cursor.execute(_SELECT_USER_BY_USERNAME, (username,))
+            rows = self._fetch_dicts(cursor)
+            return rows[0] if rows else None
         except Exception as e:
             logger.error(f"Error getting user: {e}")
             return None
@@ -263,14 +624,10 @@ class FaceDatabase:
     def get_user_by_id(self, user_id: int) -> Optional[Dict]:
         """Get user by ID"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT * FROM users WHERE id = ?
-                ''', (user_id,))
-                row = cursor.fetchone()
-                return dict(row) if row else None
+            cursor = self._read_conn.cursor()
+            cursor.execute(_SELECT_USER_BY_ID, (user_id,))
+            rows = self._fetch_dicts(cursor)
+            return rows[0] if rows else None
         except Exception as e:
             logger.error(f"Error getting user: {e}")
             return None
@@ -278,15 +635,9 @@ class FaceDatabase:
     def get_all_users(self) -> List[Dict]:
         """Get all users"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT id, username, email, role, is_active, created_at, last_login
-                    FROM users
-                    ORDER BY username
-                ''')
-                return [dict(row) for row in cursor.fetchall()]
+            cursor = self._read_conn.cursor()
+            cursor.execute(_SELECT_ALL_USERS)
+            return self._fetch_dicts(cursor)
         except Exception as e:
             logger.error(f"Error getting users: {e}")
             return []
@@ -294,21 +645,16 @@ class FaceDatabase:
     def update_user(self, user_id: int, **kwargs) -> bool:
         """Update user fields"""
         try:
-            allowed_fields = ['email', 'role', 'is_active']
-            updates = {k: v for k, v in kwargs.items() if k in allowed_fields}
+            fields = tuple(sorted(_USER_UPDATE_FIELDS.intersection(kwargs)))
             
-            if not updates:
+            if not fields:
                 return False
             
-            set_clause = ', '.join([f"{k} = ?" for k in updates.keys()])
-            values = list(updates.values()) + [user_id]
+            values = (*(kwargs[k] for k in fields), user_id)
             
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(f'''
-                    UPDATE users SET {set_clause} WHERE id = ?
-                ''', values)
-                conn.commit()
+            with self._write_lock:
+                cursor = self._conn.cursor()
+                cursor.execute(_update_user_sql(fields), values)
                 return cursor.rowcount > 0
         except Exception as e:
             logger.error(f"Error updating user: {e}")
@@ -317,13 +663,10 @@ class FaceDatabase:
     def update_user_password(self, user_id: int, password_hash: str) -> bool:
         """Update user password"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    UPDATE users SET password_hash = ? WHERE id = ?
-                ''', (password_hash, user_id))
-                conn.commit()
-                return cursor.rowcount > 0
+            with self._write_lock:
+                cursor = self._conn.cursor()
+                cursor.execute(_UPDATE_USER_PASSWORD, (password_hash, user_id))
+                return cursor.fetchone() is not None
         except Exception as e:
             logger.error(f"Error updating password: {e}")
             return False
@@ -331,27 +674,37 @@ class FaceDatabase:
     def update_last_login(self, user_id: int) -> bool:
         """Update last login timestamp"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    UPDATE users SET last_login = ? WHERE id = ?
-                ''', (time.time(), user_id))
-                conn.commit()
-                return True
+            with self._write_lock:
+                cursor = self._conn.cursor()
+                cursor.execute(_UPDATE_LAST_LOGIN, (time.time(), user_id))
+                return cursor.fetchone() is not None
         except Exception as e:
             logger.error(f"Error updating last login: {e}")
             return False
     
+    def login_user(self, username: str) -> Optional[Dict]:
+        """
+        Stamp last_login for an active user and return the updated row in
+        one statement. Only call after the password has been verified
+        Returns: user dict, or None if the user is missing or disabled
+        """
+        try:
+            with self._write_lock:
+                cursor = self._conn.cursor()
+                cursor.execute(_LOGIN_USER, (time.time(), username))
+                rows = self._fetch_dicts(cursor)
+                return rows[0] if rows else None
+        except Exception as e:
+            logger.error(f"Error updating last login: {e}")
+            return None
+    
     def delete_user(self, user_id: int) -> bool:
         """Delete user (soft delete - sets is_active to False)"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    UPDATE users SET is_active = 0 WHERE id = ?
-                ''', (user_id,))
-                conn.commit()
-                return cursor.rowcount > 0
+            with self._write_lock:
+                cursor = self._conn.cursor()
+                cursor.execute(_DEACTIVATE_USER, (user_id,))
+                return cursor.fetchone() is not None
         except Exception as e:
             logger.error(f"Error deleting user: {e}")
             return False
@@ -359,140 +712,118 @@ class FaceDatabase:
     # ============ AUDIT LOG ============
     
     def log_audit(self, user_id: int, action: str, details: Optional[str] = None):
-        """Log user action for audit trail"""
+        """Record a standalone user action in the audit trail"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO audit_log (timestamp, user_id, action, details)
-                    VALUES (?, ?, ?, ?)
-                ''', (time.time(), user_id, action, details))
-                conn.commit()
+            with self._write_tx() as cursor:
+                self._log_audit(cursor, user_id, action, details)
         except Exception as e:
-            logger.error(f"Error logging audit: {e}")
+            logger.error(f"Error logging audit entry: {e}")
+    
+    @staticmethod
+    def _log_audit(cursor: sqlite3.Cursor, user_id: int, action: str, details: Optional[str] = None):
+        """Record an audit entry inside the caller's write transaction"""
+        cursor.execute(_INSERT_AUDIT_LOG, (time.time(), user_id, action, details))
     
     def get_audit_logs(self, user_id: Optional[int] = None, limit: int = 100) -> List[Dict]:
         """Get audit logs"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                if user_id:
-                    cursor.execute('''
-                        SELECT a.*, u.username 
-                        FROM audit_log a
-                        JOIN users u ON a.user_id = u.id
-                        WHERE a.user_id = ?
-                        ORDER BY a.timestamp DESC
-                        LIMIT ?
-                    ''', (user_id, limit))
-                else:
-                    cursor.execute('''
-                        SELECT a.*, u.username 
-                        FROM audit_log a
-                        JOIN users u ON a.user_id = u.id
-                        ORDER BY a.timestamp DESC
-                        LIMIT ?
-                    ''', (limit,))
-                
-                return [dict(row) for row in cursor.fetchall()]
+            cursor = self._read_conn.cursor()
+            
+            if user_id:
+                cursor.execute(_SELECT_AUDIT_LOGS_BY_USER, (user_id, limit))
+            else:
+                cursor.execute(_SELECT_AUDIT_LOGS, (limit,))
+            
+            return self._fetch_dicts(cursor)
         except Exception as e:
             logger.error(f"Error getting audit logs: {e}")
             return []
 
     # ============ FACE LOGS ============
     
-    def log_face_event(self, event, user_id: Optional[int] = None) -> int:
-        """Log a face recognition event"""
+    def log_face_event(self, event, user_id: Optional[int] = None) -> None:
+        """
+        Queue a face recognition event for the background writer
+        The event (an AlertEvent) must already hold SQLite-bindable types
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO face_logs (
-                        timestamp, camera_id, camera_name, face_name,
-                        age, gender, confidence, screenshot_path, user_id
-                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    float(event.timestamp),
-                    int(event.camera_id),
-                    str(event.camera_name),
-                    str(event.face_name),
-                    int(event.age) if event.age else None,
-                    str(event.gender) if event.gender else None,
-                    float(event.confidence),
-                    str(event.screenshot_path) if event.screenshot_path else None,
-                    user_id
-                ))
-                conn.commit()
-                return cursor.lastrowid
+            self._enqueue_write(_INSERT_FACE_LOG, (
+                event.timestamp, event.camera_id, event.camera_name, event.face_name,
+                event.age, event.gender, event.confidence, event.screenshot_path, user_id
+            ))
         except Exception as e:
             logger.error(f"Error logging face event: {e}")
             raise
 
-    def get_face_logs(self, limit: int = 100, 
+    def iter_face_logs(self, limit: int = 100, 
                  camera_id: Optional[int] = None,
                  face_name: Optional[str] = None,
                  start_time: Optional[float] = None,
-                 end_time: Optional[float] = None) -> List[FaceLogEntry]:
-        """Retrieve face logs with optional filters"""
-        try:
-            query = '''
-                SELECT id, timestamp, camera_id, camera_name, face_name, 
-                       age, gender, confidence, screenshot_path, user_id
-                FROM face_logs
-            '''
-            params = []
-            conditions = []
+                 end_time: Optional[float] = None,
+                 before_timestamp: Optional[float] = None,
+                 before_id: Optional[int] = None) -> Iterator[FaceLogEntry]:
+        """
+        Stream face logs with optional filters, newest first, fetching
+        _FACE_LOG_ARRAYSIZE rows at a time
+        Pass the timestamp and id of the last entry of a page as
+        before_timestamp/before_id to fetch the next (older) page
+        """
+        query = _SELECT_FACE_LOGS
+        params = []
+        conditions = []
+        
+        if camera_id is not None:
+            conditions.append("camera_id = ?")
+            params.append(camera_id)
             
-            if camera_id is not None:
-                conditions.append("camera_id = ?")
-                params.append(camera_id)
-                
-            if face_name is not None:
-                conditions.append("face_name = ?")
-                params.append(face_name)
-                
-            if start_time is not None:
-                conditions.append("timestamp >= ?")
-                params.append(float(start_time))
-                
-            if end_time is not None:
-                conditions.append("timestamp <= ?")
-                params.append(float(end_time))
-                
-            if conditions:
-                query += " WHERE " + " AND ".join(conditions)
-                
-            query += " ORDER BY timestamp DESC LIMIT ?"
-            params.append(limit)
+        if face_name is not None:
+            conditions.append("face_name = ?")
+            params.append(face_name)
             
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute(query, params)
-                
-                entries = []
-                for row in cursor.fetchall():
-                    try:
-                        entries.append(FaceLogEntry(
-                            id=row['id'],
-                            timestamp=float(row['timestamp']),
-                            camera_id=row['camera_id'],
-                            camera_name=row['camera_name'],
-                            face_name=row['face_name'],
-                            age=row['age'],
-                            gender=row['gender'],
-                            confidence=float(row['confidence']),
-                            screenshot_path=row['screenshot_path'],
-                            user_id=row['user_id']
-                        ))
-                    except Exception as e:
-                        logger.error(f"Error converting row {dict(row)}: {e}")
-                        continue
-                        
-                return entries
-                
+        if start_time is not None:
+            conditions.append("timestamp >= ?")
+            params.append(float(start_time))
+            
+        if end_time is not None:
+            conditions.append("timestamp <= ?")
+            params.append(float(end_time))
+        
+        # Keyset pagination: resume strictly after the previous page's last row.
+        # The row-value form lets SQLite seek the (..., timestamp DESC, id DESC)
+        # indexes to the resume point; the equivalent OR scans from the top
+        if before_timestamp is not None and before_id is not None:
+            conditions.append("(timestamp, id) < (?, ?)")
+            params.extend((float(before_timestamp), before_id))
+        elif before_timestamp is not None:
+            conditions.append("timestamp < ?")
+            params.append(float(before_timestamp))
+            
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+            
+        query += " ORDER BY timestamp DESC, id DESC LIMIT ?"
+        params.append(limit)
+        
+        cursor = self._read_conn.cursor()
+        cursor.arraysize = _FACE_LOG_ARRAYSIZE
+        cursor.execute(query, params)
+        
+        # Columns are selected in FaceLogEntry field order
+        while rows := cursor.fetchmany():
+            for row in rows:
+                yield FaceLogEntry(*row)
+
+    def get_face_logs(self, limit: int = 100, 
+                 camera_id: Optional[int] = None,
+                 face_name: Optional[str] = None,
+                 start_time: Optional[float] = None,
+                 end_time: Optional[float] = None,
+                 before_timestamp: Optional[float] = None,
+                 before_id: Optional[int] = None) -> List[FaceLogEntry]:
+        """Retrieve face logs with optional filters as a list (see iter_face_logs)"""
+        try:
+            return list(self.iter_face_logs(limit, camera_id, face_name, start_time,
+                                            end_time, before_timestamp, before_id))
         except Exception as e:
             logger.error(f"Error retrieving face logs: {e}")
             return []
@@ -505,20 +836,14 @@ class FaceDatabase:
                       created_by: Optional[int] = None) -> bool:
         """Add a known face to the database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    INSERT INTO known_faces (name, lastname, age, cedula, birth_date, 
-                                            crime, case_number, embedding, image_path, 
-                                            created_at, created_by)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (name, lastname, age, cedula, birth_date, crime, case_number,
-                      embedding, image_path, time.time(), created_by))
-                conn.commit()
+            with self._write_tx() as cursor:
+                cursor.execute(_INSERT_KNOWN_FACE, (name, lastname, age, cedula, birth_date, crime,
+                                                    case_number, embedding, image_path,
+                                                    time.time(), created_by))
                 
                 if created_by:
-                    self.log_audit(created_by, 'add_face', 
-                                 f"Added face: {name} {lastname} - Cedula: {cedula}")
+                    self._log_audit(cursor, created_by, 'add_face',
+                                    f"Added face: {name} {lastname} - Cedula: {cedula}")
                 
                 return True
         except sqlite3.IntegrityError:
@@ -528,36 +853,69 @@ class FaceDatabase:
             logger.error(f"Error adding known face: {e}")
             return False
 
-    def get_known_faces(self) -> List[dict]:
-        """Retrieve all known faces from the database"""
+    def get_known_faces(self, with_embeddings: bool = True) -> List[dict]:
+        """
+        Retrieve all known faces from the database, ordered by id. Without
+        embeddings only the metadata columns are read
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                cursor.execute('''
-                    SELECT id, name, lastname, age, cedula, birth_date, crime, 
-                           case_number, embedding, image_path 
-                    FROM known_faces
-                ''')
-                return [dict(row) for row in cursor.fetchall()]
+            cursor = self._read_conn.cursor()
+            cursor.execute(_SELECT_KNOWN_FACES if with_embeddings else _SELECT_KNOWN_FACES_METADATA)
+            faces = self._fetch_dicts(cursor)
+            
+            # Zero-copy float32 views over the BLOBs
+            if with_embeddings:
+                for face in faces:
+                    face['embedding'] = np.frombuffer(face['embedding'], dtype=np.float32)
+            return faces
         except Exception as e:
             logger.error(f"Error retrieving known faces: {e}")
             return []
 
+    def get_known_faces_version(self) -> int:
+        """Counter that changes whenever known_faces does, -1 if unavailable"""
+        try:
+            row = self._read_conn.execute(_SELECT_KNOWN_FACES_VERSION).fetchone()
+            return row[0] if row else -1
+        except Exception as e:
+            logger.error(f"Error reading known faces version: {e}")
+            return -1
+
+    def get_known_faces_matrix(self) -> Tuple[np.ndarray, List[int]]:
+        """
+        All known-face embeddings decoded at once into one contiguous (N, D)
+        float32 matrix, cached until known_faces changes
+        Returns: (embeddings, ids) where ids[i] is the known_faces id of row i
+        """
+        with self._embedding_cache_lock:
+            try:
+                # Version first: rows newer than it only make the next call rebuild
+                version = self.get_known_faces_version()
+                if self._embedding_cache is not None and self._embedding_cache[0] == version >= 0:
+                    return self._embedding_cache[1:]
+                
+                rows = self._read_conn.execute(_SELECT_KNOWN_FACE_EMBEDDINGS).fetchall()
+                ids = [row[0] for row in rows]
+                embeddings = np.frombuffer(b''.join(row[1] for row in rows), dtype=np.float32)
+                embeddings = embeddings.reshape(len(rows), -1) if rows else embeddings.reshape(0, 0)
+                
+                self._embedding_cache = (version, embeddings, ids)
+                return embeddings, ids
+            except Exception as e:
+                logger.error(f"Error building known faces matrix: {e}")
+                return np.empty((0, 0), dtype=np.float32), []
+
     def delete_known_face(self, cedula: str, deleted_by: Optional[int] = None) -> bool:
         """Delete a known face from the database"""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute('''
-                    DELETE FROM known_faces WHERE cedula = ?
-                ''', (cedula,))
-                conn.commit()
+            with self._write_tx() as cursor:
+                cursor.execute(_DELETE_KNOWN_FACE, (cedula,))
+                deleted = cursor.rowcount > 0
                 
-                if deleted_by and cursor.rowcount > 0:
-                    self.log_audit(deleted_by, 'delete_face', f"Deleted face: {cedula}")
+                if deleted_by and deleted:
+                    self._log_audit(cursor, deleted_by, 'delete_face', f"Deleted face: {cedula}")
                 
-                return cursor.rowcount > 0
+                return deleted
         except Exception as e:
             logger.error(f"Error deleting known face: {e}")
             return False
\ No newline at end of file
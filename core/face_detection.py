@@ -1,15 +1,131 @@
 import os
 import cv2
 import numpy as np
-import insightface
+import onnxruntime as ort
 from insightface.app import FaceAnalysis
-from insightface.data import get_image as ins_get_image
+from insightface.app.common import Face as InsightFace
+from insightface.utils import face_align
 from loguru import logger
-from typing import List, Dict, Tuple, Optional
+from typing import List, Tuple, Optional
 from dataclasses import dataclass
-from PIL import Image
 from pathlib import Path
 import time
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Optional SIMD cosine kernels; recognize_faces falls back to NumPy without it
+try:
+    import simsimd
+except ImportError:
+    simsimd = None
+
+# Optional FAISS index, built once the gallery outgrows brute-force NumPy
+try:
+    import faiss
+except ImportError:
+    faiss = None
+
+# Gallery sizes above which a FAISS exact inner-product index, and beyond
+# that an approximate HNSW graph, replaces the brute-force scan
+_FAISS_MIN_GALLERY = 512
+_HNSW_MIN_GALLERY = 50000
+
+# Optional compiled kernel for small galleries, where NumPy's per-call
+# dispatch overhead outweighs the matrix product itself
+try:
+    from ._cosine_numba import topk_cosine
+except ImportError:
+    topk_cosine = None
+
+# With device 'cuda', galleries of at least this many faces are matched as
+# an FP16 matrix product on the GPU (torch is imported only in that case)
+_GPU_MIN_GALLERY = 1000
+
+# Recently matched gallery rows recognize_faces tries before scanning. A
+# recent row only stands in for the full scan when it beats the recognition
+# threshold by _RECENT_MATCH_MARGIN; a closer call could be a near miss for a
+# better match elsewhere in the gallery
+_RECENT_MATCHES = 8
+_RECENT_MATCH_MARGIN = 0.1
+
+# Galleries smaller than this use topk_cosine when numba is installed
+_NUMBA_MAX_GALLERY = 2000
+
+# Normalized gallery saved next to the database (database.db -> database.gallery.npy)
+# and memory-mapped on startup; the .npz holds the known_faces version and ids it
+# was built from plus the raw embedding norms, and a stale gallery is rebuilt
+_GALLERY_SUFFIX = ".gallery.npy"
+_GALLERY_META_SUFFIX = ".gallery.npz"
+
+# Threads decoding gallery images in load_known_faces
+_IMAGE_LOAD_WORKERS = 8
+
+def _read_image(path: Path) -> Optional[np.ndarray]:
+    """Decode an image file, None if unreadable"""
+    return cv2.imread(str(path))
+
+def _write_image(path: Path, image: np.ndarray) -> None:
+    """Encode and save an image, logging failures (runs on the image-writer pool)"""
+    try:
+        if not cv2.imwrite(str(path), image):
+            logger.error(f"Could not write image {path}")
+    except Exception as e:
+        logger.error(f"Error writing image {path}: {e}")
+
+def _atomic_write(path: Path, save) -> None:
+    """Write through save(file) to a temporary file, then move it over path"""
+    tmp_path = path.with_name(path.name + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        save(f)
+    os.replace(tmp_path, path)
+
+def _row_norms(matrix: np.ndarray) -> np.ndarray:
+    """L2 norm of each row; einsum skips np.linalg.norm's generic dispatch"""
+    return np.sqrt(np.einsum('ij,ij->i', matrix, matrix))
+
+def _quantize_rows(matrix: np.ndarray) -> np.ndarray:
+    """Scale each row to fill [-127, 127] and round to int8; cosine is scale-invariant per row"""
+    # All-zero rows (a failed embedding) stay zero instead of dividing by zero
+    max_abs = np.abs(matrix).max(axis=1, keepdims=True)
+    scale = np.divide(127.0, max_abs, out=np.zeros_like(max_abs), where=max_abs > 0)
+    return np.rint(matrix * scale).astype(np.int8)
+
+class _IOBoundSession:
+    """
+    InferenceSession proxy that runs through a persistent IOBinding with
+    preallocated CUDA output buffers, reused for as long as the input shape
+    stays the same (the detector always sees det_size frames). Each thread
+    gets its own binding and outputs, since detect_faces runs concurrently
+    from the camera workers
+    """
+    def __init__(self, session):
+        self._session = session
+        self._local = threading.local()
+
+    def __getattr__(self, name):
+        return getattr(self._session, name)
+
+    def run(self, output_names, input_feed, run_options=None):
+        (input_name, blob), = input_feed.items()
+        local = self._local
+        
+        if getattr(local, 'input_shape', None) != blob.shape:
+            # First frame at this size on this thread: plain run to learn the output shapes
+            results = self._session.run(output_names, input_feed, run_options)
+            local.binding = self._session.io_binding()
+            local.outputs = [
+                ort.OrtValue.ortvalue_from_shape_and_type(out.shape, out.dtype, 'cuda', 0)
+                for out in results
+            ]
+            for name, value in zip(output_names, local.outputs):
+                local.binding.bind_ortvalue_output(name, value)
+            local.input_shape = blob.shape
+            return results
+        
+        local.binding.bind_cpu_input(input_name, blob)
+        self._session.run_with_iobinding(local.binding, run_options)
+        return [value.numpy() for value in local.outputs]
 
 @dataclass
 class Face:
@@ -19,7 +135,7 @@ class Face:
     embedding: np.ndarray
     age: Optional[int] = None
     gender: Optional[str] = None  # 'Male' or 'Female'
-    face_img: Optional[np.ndarray] = None
+    face_img: Optional[np.ndarray] = None  # view into the source frame
 
 @dataclass
 class KnownFace:
@@ -42,7 +158,30 @@ class FaceDetector:
         self.device = config['recognition']['device']
         self.analysis_enabled = config['recognition'].get('analysis_enabled', True)
         self.model = self._load_model()
+        # Resolved once: whether every face gets age/gender from the genderage model
+        self._analyze_genderage = self.analysis_enabled and 'genderage' in self.model.models
         self.known_faces: List[KnownFace] = []
+        # L2-normalized float32 embeddings, one row per entry of known_faces
+        self.known_matrix: np.ndarray = np.empty((0, 0), dtype=np.float32)
+        # int8 copy of known_matrix scanned by the SimSIMD path (4x less memory traffic)
+        self.known_matrix_i8: np.ndarray = np.empty((0, 0), dtype=np.int8)
+        # Raw embedding norms of the rows of known_matrix
+        self._gallery_norm: np.ndarray = np.empty(0, dtype=np.float32)
+        # FAISS index over known_matrix, None for small galleries or without faiss
+        self._faiss_index = None
+        # FP16 copy of known_matrix on the GPU, see _GPU_MIN_GALLERY
+        self._known_matrix_gpu = None
+        # Gallery rows matched recently, oldest first; checked before a full scan
+        self._recent_matches: OrderedDict = OrderedDict()
+        self._recent_lock = threading.Lock()
+        # Set whenever known_faces changes; recognize_faces rebuilds the matrices
+        # lazily, one thread at a time under _gallery_lock
+        self._gallery_dirty = False
+        self._gallery_lock = threading.Lock()
+        # JPEG encoding and disk writes for add_known_face, off the caller's thread
+        self._io_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="FaceImageWriter")
+        # Per-thread detection input buffers reused across frames, see _detect
+        self._det_buffers = threading.local()
         
     def _load_model(self) -> FaceAnalysis:
         """Load Model insightface"""
@@ -57,12 +196,74 @@ class FaceDetector:
                 det_thresh=self.detection_threshold,
                 det_size=(640, 640)
             )
+            
+            # Keep detector outputs resident on the GPU between frames
+            det_session = model.det_model.session
+            if 'CUDAExecutionProvider' in det_session.get_providers():
+                model.det_model.session = _IOBoundSession(det_session)
+            
             logger.success("Face detection model loaded successfully")
             return model
         except Exception as e:
             logger.error(f"Failed to load face detection model: {e}")
             raise
 
+    def _rebuild_known_matrix(self) -> None:
+        """Stack known embeddings into known_matrix with unit-length rows"""
+        known_faces = list(self.known_faces)
+        
+        if not known_faces:
+            self._set_gallery(np.empty((0, 0), dtype=np.float32), np.empty(0, dtype=np.float32))
+        else:
+            matrix = np.ascontiguousarray(np.stack([kf.embedding for kf in known_faces]), dtype=np.float32)
+            norms = _row_norms(matrix)
+            matrix /= norms[:, None]
+            self._set_gallery(matrix, norms)
+        
+        # Cleared only once the new gallery is installed, so other threads never
+        # scan a matrix that is still being built; faces appended meanwhile keep it set
+        self._gallery_dirty = len(self.known_faces) != len(known_faces)
+
+    def _set_gallery(self, matrix: np.ndarray, norms: np.ndarray) -> None:
+        """Install a normalized gallery matrix and everything derived from it"""
+        self.known_matrix = matrix
+        self._gallery_norm = norms
+        with self._recent_lock:
+            self._recent_matches.clear()
+        
+        if len(matrix) == 0:
+            self.known_matrix_i8 = np.empty((0, 0), dtype=np.int8)
+            self._faiss_index = None
+            self._known_matrix_gpu = None
+            return
+        
+        self.known_matrix_i8 = _quantize_rows(matrix)
+        self._known_matrix_gpu = self._to_gpu(matrix) if len(matrix) >= _GPU_MIN_GALLERY else None
+        
+        if faiss is None or len(matrix) <= _FAISS_MIN_GALLERY:
+            self._faiss_index = None
+        else:
+            dim = matrix.shape[1]
+            if len(matrix) > _HNSW_MIN_GALLERY:
+                index = faiss.IndexHNSWFlat(dim, 32, faiss.METRIC_INNER_PRODUCT)
+            else:
+                index = faiss.IndexFlatIP(dim)
+            index.add(np.ascontiguousarray(matrix))
+            self._faiss_index = index
+
+    def _to_gpu(self, matrix: np.ndarray):
+        """FP16 CUDA tensor of matrix, None when not running on a usable GPU"""
+        if self.device != 'cuda':
+            return None
+        try:
+            import torch
+            if not torch.cuda.is_available():
+                return None
+            return torch.from_numpy(np.array(matrix)).half().cuda()
+        except Exception as e:
+            logger.error(f"Error moving gallery to GPU: {e}")
+            return None
+
     def load_known_faces(self, known_faces_dir: str) -> None:
         """Load known faces from directory (backward compatibility)"""
         try:
@@ -73,45 +274,57 @@ class FaceDetector:
                 logger.warning(f"Known faces directory {known_faces_dir} does not exist")
                 return
                 
-            for face_file in known_faces_dir.glob('*.*'):
-                if face_file.suffix.lower() not in ['.jpg', '.jpeg', '.png']:
-                    continue
-                    
-                try:
-                    img = cv2.imread(str(face_file))
-                    if img is None:
-                        logger.warning(f"Could not read image {face_file}")
-                        continue
-                        
-                    faces = self.model.get(img)
-                    if len(faces) == 0:
-                        logger.warning(f"No faces found in {face_file}")
-                        continue
-                        
-                    face = faces[0]
-                    name = face_file.stem
+            face_files = [face_file for face_file in known_faces_dir.glob('*.*')
+                          if face_file.suffix.lower() in ['.jpg', '.jpeg', '.png']]
+            chunks = [face_files[i:i + self.max_batch_size]
+                      for i in range(0, len(face_files), self.max_batch_size)]
+            
+            # Decode on a thread pool (cv2.imread releases the GIL), reading the
+            # next chunk while the current one goes through detection
+            with ThreadPoolExecutor(max_workers=_IMAGE_LOAD_WORKERS) as executor:
+                pending = executor.map(_read_image, chunks[0]) if chunks else iter(())
+                
+                for chunk_idx, chunk in enumerate(chunks):
+                    images = list(pending)
+                    if chunk_idx + 1 < len(chunks):
+                        pending = executor.map(_read_image, chunks[chunk_idx + 1])
                     
-                    # Parse filename to extract information
-                    # Format: cedula_timestamp.jpg
-                    parts = name.rsplit('_', 1)
-                    cedula = parts[0] if len(parts) > 1 else name
+                    readable = []
+                    for face_file, img in zip(chunk, images):
+                        if img is None:
+                            logger.warning(f"Could not read image {face_file}")
+                        else:
+                            readable.append((face_file, img))
                     
-                    self.known_faces.append(KnownFace(
-                        name=name,
-                        lastname="",
-                        age=0,
-                        cedula=cedula,
-                        birth_date="",
-                        crime="",
-                        case_number="",
-                        embedding=face.embedding,
-                        image_path=str(face_file)
-                    ))
-                    logger.info(f"Loaded known face: {name}")
+                    detected = self.detect_faces_batch([img for _, img in readable])
                     
-                except Exception as e:
-                    logger.error(f"Error processing {face_file}: {e}")
+                    for (face_file, _), faces in zip(readable, detected):
+                        if len(faces) == 0:
+                            logger.warning(f"No faces found in {face_file}")
+                            continue
+                            
+                        face = faces[0]
+                        name = face_file.stem
+                        
+                        # Parse filename to extract information
+                        # Format: cedula_timestamp.jpg
+                        parts = name.rsplit('_', 1)
+                        cedula = parts[0] if len(parts) > 1 else name
+                        
+                        self.known_faces.append(KnownFace(
+                            name=name,
+                            lastname="",
+                            age=0,
+                            cedula=cedula,
+                            birth_date="",
+                            crime="",
+                            case_number="",
+                            embedding=face.embedding,
+                            image_path=str(face_file)
+                        ))
+                        logger.info(f"Loaded known face: {name}")
                     
+            self._gallery_dirty = True
             logger.info(f"Loaded {len(self.known_faces)} known faces")
             
         except Exception as e:
@@ -122,81 +335,233 @@ class FaceDetector:
         """Load known faces from database"""
         try:
             self.known_faces.clear()
-            db_faces = database.get_known_faces()
+            db_path = Path(database.db_path)
+            version = database.get_known_faces_version()
+            metadata = database.get_known_faces(with_embeddings=False)
+            face_ids = [face['id'] for face in metadata]
             
-            for face_data in db_faces:
-                try:
-                    embedding = np.frombuffer(face_data['embedding'], dtype=np.float32)
-                    
-                    self.known_faces.append(KnownFace(
-                        name=face_data['name'],
-                        lastname=face_data['lastname'],
-                        age=face_data['age'],
-                        cedula=face_data['cedula'],
-                        birth_date=face_data['birth_date'],
-                        crime=face_data['crime'],
-                        case_number=face_data['case_number'],
-                        embedding=embedding,
-                        image_path=face_data['image_path']
-                    ))
-                except Exception as e:
-                    logger.error(f"Error processing face data: {e}")
-                    continue
+            # A gallery saved at this version stands in for the embeddings:
+            # each KnownFace keeps a unit-length row view of the memory map
+            gallery = self._read_gallery(db_path, version, face_ids)
+            if gallery is not None:
+                embeddings = gallery[0]
+            else:
+                # Every embedding decoded at once into one (N, D) matrix
+                embeddings, matrix_ids = database.get_known_faces_matrix()
+                if matrix_ids != face_ids:
+                    # A face added or deleted between the two reads is left for the next load
+                    rows = {face_id: i for i, face_id in enumerate(matrix_ids)}
+                    metadata = [face for face in metadata if face['id'] in rows]
+                    face_ids = [face['id'] for face in metadata]
+                    embeddings = embeddings[[rows[face_id] for face_id in face_ids]]
             
+            for face_data, embedding in zip(metadata, embeddings):
+                self.known_faces.append(KnownFace(
+                    name=face_data['name'],
+                    lastname=face_data['lastname'],
+                    age=face_data['age'],
+                    cedula=face_data['cedula'],
+                    birth_date=face_data['birth_date'],
+                    crime=face_data['crime'],
+                    case_number=face_data['case_number'],
+                    embedding=embedding,
+                    image_path=face_data['image_path']
+                ))
+            
+            if gallery is not None:
+                self._set_gallery(*gallery)
+                self._gallery_dirty = False
+                logger.info(f"Loaded {len(self.known_faces)} known faces from saved gallery")
+                return
+            
+            self._rebuild_known_matrix()
+            self._save_gallery(db_path, version, face_ids)
             logger.info(f"Loaded {len(self.known_faces)} known faces from database")
             
         except Exception as e:
             logger.error(f"Error loading known faces from database: {e}")
 
+    def _read_gallery(self, db_path: Path, version: int,
+                      face_ids: List[int]) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """(memory-mapped matrix, norms) saved for version and face_ids, None if missing or stale"""
+        matrix_path = db_path.with_suffix(_GALLERY_SUFFIX)
+        meta_path = db_path.with_suffix(_GALLERY_META_SUFFIX)
+        if version < 0 or not face_ids or not matrix_path.exists() or not meta_path.exists():
+            return None
+        
+        try:
+            with np.load(meta_path) as meta:
+                if int(meta['version']) != version or not np.array_equal(meta['ids'], face_ids):
+                    return None
+                norms = meta['norms']
+            return np.load(matrix_path, mmap_mode='r'), norms
+        except Exception as e:
+            logger.error(f"Error reading saved gallery: {e}")
+            return None
+
+    def _save_gallery(self, db_path: Path, version: int, face_ids: List[int]) -> None:
+        """Save known_matrix for _read_gallery, tagged with the database version"""
+        if version < 0 or not face_ids:
+            return
+        
+        try:
+            matrix, norms = self.known_matrix, self._gallery_norm
+            # Temporary files first so a crash never leaves a torn gallery
+            _atomic_write(db_path.with_suffix(_GALLERY_SUFFIX), lambda f: np.save(f, matrix))
+            _atomic_write(db_path.with_suffix(_GALLERY_META_SUFFIX),
+                          lambda f: np.savez(f, version=np.int64(version),
+                                             ids=np.asarray(face_ids, dtype=np.int64), norms=norms))
+        except Exception as e:
+            logger.error(f"Error saving gallery: {e}")
+
     def detect_faces(self, image: np.ndarray) -> List[Face]:
         """Detect faces in an image"""
+        return self.detect_faces_batch([image])[0]
+
+    def _detect(self, image: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        SCRFD detect() with the letterbox canvas and resize target reused
+        per thread instead of allocated for every frame
+        
+        Returns:
+            (detections [N, 5] as x1, y1, x2, y2, score; keypoints [N, 5, 2])
+        """
+        det_model = self.model.det_model
+        input_w, input_h = det_model.input_size
+        
+        if image.shape[0] / image.shape[1] > input_h / input_w:
+            new_height = input_h
+            new_width = int(new_height / (image.shape[0] / image.shape[1]))
+        else:
+            new_width = input_w
+            new_height = int(new_width * (image.shape[0] / image.shape[1]))
+        det_scale = new_height / image.shape[0]
+        
+        buffers = self._det_buffers
+        canvas = getattr(buffers, 'canvas', None)
+        if canvas is None or canvas.shape != (input_h, input_w, 3):
+            canvas = buffers.canvas = np.zeros((input_h, input_w, 3), dtype=np.uint8)
+        resized = getattr(buffers, 'resized', None)
+        if resized is None or resized.shape != (new_height, new_width, 3):
+            resized = buffers.resized = np.empty((new_height, new_width, 3), dtype=np.uint8)
+            # Clear what a previous, differently shaped frame left in the padding
+            canvas[:] = 0
+        
+        cv2.resize(image, (new_width, new_height), dst=resized)
+        canvas[:new_height, :new_width] = resized
+        
+        scores_list, bboxes_list, kpss_list = det_model.forward(canvas, det_model.det_thresh)
+        
+        scores = np.vstack(scores_list)
+        order = scores.ravel().argsort()[::-1]
+        bboxes = np.vstack(bboxes_list) / det_scale
+        kpss = np.vstack(kpss_list) / det_scale
+        
+        pre_det = np.hstack((bboxes, scores)).astype(np.float32, copy=False)[order, :]
+        keep = det_model.nms(pre_det)
+        return pre_det[keep, :], kpss[order][keep]
+
+    def detect_faces_batch(self, images: List[np.ndarray]) -> List[List[Face]]:
+        """
+        Detect faces in several images, computing every embedding in a single
+        recognition-model run over the aligned crops of all images
+        
+        Returns:
+            One list of faces per input image
+        """
         try:
-            faces = self.model.get(image)
-            results = []
+            rec_model = self.model.models['recognition']
+            ga_model = self.model.models['genderage'] if self._analyze_genderage else None
             
-            for face in faces:
-                face_img = self._extract_face_image(image, face.bbox)
-
-                results.append(Face(
-                    bbox=face.bbox,
-                    kps=face.kps,
-                    det_score=face.det_score,
-                    embedding=face.embedding,
-                    age=self._get_age(face),
-                    gender=self._get_gender(face),
-                    face_img=face_img
-                ))
+            detected = []
+            crops = []
+            for image in images:
+                bboxes, kpss = self._detect(image)
+                faces = []
+                for bbox, kps in zip(bboxes, kpss):
+                    face = InsightFace(bbox=bbox[0:4], kps=kps, det_score=bbox[4])
+                    if ga_model is not None:
+                        ga_model.get(image, face)
+                    faces.append(face)
+                    crops.append(face_align.norm_crop(image, landmark=kps, image_size=rec_model.input_size[0]))
+                detected.append(faces)
+            
+            # The ArcFace graph has a dynamic batch axis: one session.run for all crops
+            embeddings = iter(rec_model.get_feat(crops) if crops else [])
+            
+            results = []
+            for image, faces in zip(images, detected):
+                for face in faces:
+                    face.embedding = next(embeddings).flatten()
+                results.append([self._to_face(image, face) for face in faces])
             return results
         except Exception as e:
-            logger.error(f"Error detecting faces: {e}")
-            return []
+            logger.error(f"Error detecting faces in batch: {e}")
+            return [[] for _ in images]
+
+    def _to_face(self, image: np.ndarray, face) -> Face:
+        """Convert an insightface result into a Face"""
+        return Face(
+            bbox=face.bbox,
+            kps=face.kps,
+            det_score=face.det_score,
+            embedding=face.embedding,
+            age=self._get_age(face),
+            gender=self._get_gender(face),
+            face_img=self._extract_face_image(image, face.bbox)
+        )
 
     def recognize_faces(self, faces: List[Face]) -> List[Tuple[Face, Optional[KnownFace], float]]:
         """Recognize faces against known faces database"""
-        results = []
+        results = [(face, None, 0.0) for face in faces]
         
         if not self.known_faces:
-            return [(face, None, 0.0) for face in faces]
+            return results
             
         try:
-            known_embeddings = np.array([kf.embedding for kf in self.known_faces])
+            if self._gallery_dirty:
+                with self._gallery_lock:
+                    if self._gallery_dirty:
+                        self._rebuild_known_matrix()
             
-            for face in faces:
-                if face.embedding is None or len(face.embedding) == 0:
-                    results.append((face, None, 0.0))
-                    continue
-                    
-                similarities = np.dot(known_embeddings, face.embedding) / (
-                    np.linalg.norm(known_embeddings, axis=1) * np.linalg.norm(face.embedding)
-                )
-                
-                max_idx = np.argmax(similarities)
-                max_similarity = similarities[max_idx]
-                
-                if max_similarity > self.recognition_threshold:
-                    results.append((face, self.known_faces[max_idx], max_similarity))
+            valid = [i for i, face in enumerate(faces)
+                     if face.embedding is not None and len(face.embedding) > 0]
+            if not valid:
+                return results
+            
+            probes = np.stack([faces[i].embedding for i in valid]).astype(np.float32, copy=False)
+            probes /= _row_norms(probes)[:, None]
+            
+            max_idx = np.full(len(valid), -1, dtype=np.int64)
+            max_similarity = np.zeros(len(valid), dtype=np.float32)
+            
+            # Faces that stay on camera keep matching the same few gallery
+            # rows: score those first and only scan the gallery for the rest
+            with self._recent_lock:
+                recent = np.fromiter(self._recent_matches, dtype=np.int64)
+            if len(recent):
+                recent_similarities = probes @ self.known_matrix[recent].T
+                best = recent_similarities.argmax(axis=1)
+                max_similarity[:] = recent_similarities[np.arange(len(valid)), best]
+                max_idx[:] = recent[best]
+            misses = max_similarity <= self.recognition_threshold + _RECENT_MATCH_MARGIN
+            
+            if misses.any():
+                max_idx[misses], max_similarity[misses] = self._best_matches(probes[misses])
+            
+            with self._recent_lock:
+                for idx in max_idx[max_similarity > self.recognition_threshold]:
+                    self._recent_matches[int(idx)] = None
+                    self._recent_matches.move_to_end(int(idx))
+                while len(self._recent_matches) > _RECENT_MATCHES:
+                    self._recent_matches.popitem(last=False)
+            
+            for i, idx, similarity in zip(valid, max_idx, max_similarity):
+                # idx is -1 when HNSW found no neighbour
+                if idx >= 0 and similarity > self.recognition_threshold:
+                    results[i] = (faces[i], self.known_faces[idx], similarity)
                 else:
-                    results.append((face, None, max_similarity))
+                    results[i] = (faces[i], None, similarity)
                     
         except Exception as e:
             logger.error(f"Error recognizing faces: {e}")
@@ -204,8 +569,45 @@ class FaceDetector:
             
         return results
 
-    def _extract_face_image(self, image: np.ndarray, bbox: np.ndarray) -> np.ndarray:
-        """Extract face region from image"""
+    def _best_matches(self, probes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Full gallery scan for L2-normalized probes
+        Returns: (best row index, similarity) per probe
+        """
+        gallery_gpu = self._known_matrix_gpu
+        if gallery_gpu is not None:
+            import torch
+            with torch.no_grad():
+                similarities = torch.from_numpy(probes).to(gallery_gpu.device).half() @ gallery_gpu.T
+                max_similarity, max_idx = similarities.max(dim=1)
+            return max_idx.cpu().numpy(), max_similarity.float().cpu().numpy()
+        
+        faiss_index = self._faiss_index
+        if faiss_index is not None:
+            scores, indices = faiss_index.search(probes, 1)
+            return indices[:, 0], scores[:, 0]
+        
+        if topk_cosine is not None and len(self.known_matrix) < _NUMBA_MAX_GALLERY:
+            max_similarity = np.empty(len(probes), dtype=np.float32)
+            max_idx = np.empty(len(probes), dtype=np.int64)
+            topk_cosine(probes, np.asarray(self.known_matrix), max_similarity, max_idx)
+            return max_idx, max_similarity
+        
+        if simsimd is not None:
+            similarities = 1.0 - np.asarray(simsimd.cdist(
+                _quantize_rows(probes), self.known_matrix_i8, metric='cosine'))
+        else:
+            # Rows of known_matrix are unit length, so cosine is a plain dot product
+            similarities = probes @ self.known_matrix.T
+        
+        max_idx = similarities.argmax(axis=1)
+        return max_idx, similarities[np.arange(len(probes)), max_idx]
+
+    def _extract_face_image(self, image: np.ndarray, bbox: np.ndarray, copy: bool = False) -> np.ndarray:
+        """
+        Extract face region from image. Without copy the result is a view into
+        image, so callers keeping it past the frame's lifetime must copy it
+        """
         x1, y1, x2, y2 = map(int, bbox)
         x1 = max(0, x1)
         y1 = max(0, y1)
@@ -215,26 +617,33 @@ class FaceDetector:
         if x1 >= x2 or y1 >= y2:
             return np.array([])
             
-        return image[y1:y2, x1:x2].copy()
+        face_img = image[y1:y2, x1:x2]
+        return face_img.copy() if copy else face_img
 
     def add_known_face(self, image: np.ndarray, name: str, lastname: str,
                       age: int, cedula: str, birth_date: str,
                       crime: str, case_number: str,
-                      save_dir: str, database=None, created_by=None) -> bool:
-        """Add a new known face to the database"""
+                      save_dir: str, database=None, created_by=None,
+                      face: Optional[Face] = None) -> bool:
+        """
+        Add a new known face to the database. Pass face when image was already
+        run through detect_faces to skip detecting it again
+        """
         try:
             save_dir = Path(save_dir)
             save_dir.mkdir(parents=True, exist_ok=True)
             
-            faces = self.detect_faces(image)
-            if not faces:
-                logger.warning("No faces found in the provided image")
-                return False
-                
-            face = faces[0]
+            if face is None:
+                faces = self.detect_faces(image)
+                if not faces:
+                    logger.warning("No faces found in the provided image")
+                    return False
+                face = faces[0]
+            
             timestamp = int(time.time())
             face_path = save_dir / f"{cedula}_{timestamp}.jpg"
-            cv2.imwrite(str(face_path), image)
+            # Copy: the caller may reuse the frame buffer before the write runs
+            self._io_pool.submit(_write_image, face_path, image.copy())
             
             # Save to database if provided
             if database:
@@ -259,6 +668,7 @@ class FaceDetector:
                 embedding=face.embedding,
                 image_path=str(face_path)
             ))
+            self._gallery_dirty = True
             
             logger.info(f"Added new known face: {name} {lastname} - Cedula: {cedula}")
             return True
@@ -269,15 +679,12 @@ class FaceDetector:
 
     def _get_age(self, face) -> Optional[int]:
         """Extract age estimation if available"""
-        if not self.analysis_enabled:
-            return None
-        return int(face.age) if hasattr(face, 'age') else None
+        return int(face.age) if self._analyze_genderage else None
     
     def _get_gender(self, face) -> Optional[str]:
         """Extract gender prediction if available"""
-        if not self.analysis_enabled:
-            return None
-        if not hasattr(face, 'sex') or face.sex is None:
+        if not self._analyze_genderage:
             return None
-        return 'Female' if np.argmax(face.sex) == 1 else 'Male'
+        # insightface stores argmax of the genderage logits: 1 = male, 0 = female
+        return 'Male' if face.gender == 1 else 'Female'
     
\ No newline at end of file
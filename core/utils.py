@@ -69,6 +69,9 @@ def numpy_to_pixmap(image: np.ndarray) -> 'QPixmap':
         
         if image is None:
             return QPixmap()
+        
+        # QImage needs a contiguous buffer (frames may be flipped views)
+        image = np.ascontiguousarray(image)
             
         if len(image.shape) == 2:  # Grayscale
             h, w = image.shape
@@ -6,7 +6,16 @@ Ejecuta esto para agregar la columna faltante a la base de datos
 import sqlite3
 from pathlib import Path
 from datetime import datetime
-import shutil
+
+def connect_database(db_path):
+    """Abrir conexión con los mismos PRAGMAs que usa FaceDatabase (WAL)"""
+    conn = sqlite3.connect(db_path)
+    cursor = conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA mmap_size=268435456")
+    return conn
 
 def backup_database(db_path):
     """Crear backup de seguridad antes de la migración"""
@@ -19,7 +28,14 @@ def backup_database(db_path):
     try:
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_path = db_path.parent / f"database_backup_{timestamp}.db"
-        shutil.copy2(db_path, backup_path)
+        # Con WAL los cambios recientes pueden estar aún en el archivo -wal:
+        # la API de backup de SQLite los incluye, copiar el .db no
+        source = connect_database(db_path)
+        target = sqlite3.connect(backup_path)
+        with target:
+            source.backup(target)
+        target.close()
+        source.close()
         print(f"   ✅ Backup creado: {backup_path}")
         return backup_path
     except Exception as e:
@@ -37,7 +53,7 @@ def migrate_known_faces_table(db_path):
     print("\n🔧 Migrando tabla known_faces...")
     
     try:
-        conn = sqlite3.connect(db_path)
+        conn = connect_database(db_path)
         cursor = conn.cursor()
         
         # Verificar si la tabla existe
@@ -158,7 +174,7 @@ def verify_migration(db_path):
     print("\n🔍 Verificando migración...")
     
     try:
-        conn = sqlite3.connect(db_path)
+        conn = connect_database(db_path)
         cursor = conn.cursor()
         
         # Verificar columnas
@@ -1,14 +1,15 @@
 
 
 import sys
+import threading
 import yaml
+from concurrent.futures import Future
 from pathlib import Path
 from loguru import logger
 from PyQt5.QtWidgets import QApplication, QSplashScreen, QMessageBox
 from PyQt5.QtGui import QPixmap
-from PyQt5.QtCore import Qt, QTimer
+from PyQt5.QtCore import Qt, QTimer, QEventLoop, QMetaObject
 
-from ui.main_window import MainWindow
 from ui.login_window import LoginWindow
 from core.auth_manager import AuthManager
 
@@ -63,6 +64,14 @@ def setup_logging(log_dir: str):
         filter=lambda record: "auth" in record["extra"] or "security" in record["extra"]
     )
 
+def load_face_detector(config: dict):
+    """
+    Import and build the face detector. Runs on the model-loader thread so
+    the insightface/ONNX import cost overlaps with the login window too.
+    """
+    from core.face_detection import FaceDetector
+    return FaceDetector(config)
+
 def show_splash_screen(config: dict) -> QSplashScreen:
     """Create and display splash screen with logo"""
     try:
@@ -98,9 +107,10 @@ def main():
     Flow:
     1. Load configuration and setup logging
     2. Initialize database and auth manager
-    3. Show login window
-    4. On successful login, show main application
-    5. Maintain user session throughout
+    3. Start loading the AI models in the background
+    4. Show login window
+    5. On successful login, wait for the models and show main application
+    6. Maintain user session throughout
     """
     try:
         # Load configuration
@@ -128,6 +138,27 @@ def main():
         # Initialize authentication manager
         auth_manager = AuthManager(database)
         
+        # Load AI models while the user logs in. A daemon thread rather than
+        # an executor, whose workers are joined at exit: cancelling the login
+        # must not wait for the models to finish loading
+        detector_future = Future()
+        
+        def on_models_loaded(future):
+            if future.exception() is not None:
+                logger.error(f"Failed to load AI models in background: {future.exception()}")
+            else:
+                logger.info("AI models loaded in background")
+        
+        detector_future.add_done_callback(on_models_loaded)
+        
+        def load_models():
+            try:
+                detector_future.set_result(load_face_detector(config))
+            except Exception as e:
+                detector_future.set_exception(e)
+        
+        threading.Thread(target=load_models, daemon=True, name="ModelLoader").start()
+        
         splash.showMessage(
             "Loading authentication system...",
             Qt.AlignBottom | Qt.AlignCenter,
@@ -165,8 +196,19 @@ def main():
         )
         app.processEvents()
         
+        # Keep the splash responsive until the background load finishes. The
+        # done callback runs on the loader thread, so it quits the loop through
+        # a queued call (or at once if the models are already loaded)
+        if not detector_future.done():
+            wait_loop = QEventLoop()
+            detector_future.add_done_callback(
+                lambda f: QMetaObject.invokeMethod(wait_loop, "quit", Qt.QueuedConnection))
+            wait_loop.exec_()
+        face_detector = detector_future.result()
+        
         # Initialize main window with authenticated user
-        window = MainWindow(config, auth_manager, database)
+        from ui.main_window import MainWindow
+        window = MainWindow(config, auth_manager, database, face_detector)
         
         # Setup final close timer
         def show_main_window():
@@ -1,8 +1,49 @@
 
+import hashlib
 import sqlite3
+import sys
+from datetime import datetime
 from pathlib import Path
 from loguru import logger
 
+# Esquema completo de known_faces (create_new_table y clone_known_faces_table)
+KNOWN_FACES_COLUMNS = (
+    ('id', 'INTEGER PRIMARY KEY AUTOINCREMENT'),
+    ('name', 'TEXT NOT NULL'),
+    ('lastname', 'TEXT'),
+    ('age', 'INTEGER'),
+    ('cedula', 'TEXT UNIQUE'),
+    ('birth_date', 'TEXT'),
+    ('crime', 'TEXT'),
+    ('case_number', 'TEXT'),
+    ('embedding', 'BLOB NOT NULL'),
+    ('image_path', 'TEXT NOT NULL'),
+    ('created_at', 'REAL NOT NULL'),
+    ('created_by', 'INTEGER'),
+)
+
+# Columnas que se agregaron después de la primera versión de known_faces
+REQUIRED_COLUMNS = (
+    ('lastname', 'TEXT'),
+    ('age', 'INTEGER'),
+    ('cedula', 'TEXT'),
+    ('birth_date', 'TEXT'),
+    ('crime', 'TEXT'),
+    ('case_number', 'TEXT'),
+)
+REQUIRED_COLUMN_NAMES = frozenset(name for name, _ in REQUIRED_COLUMNS)
+
+# Definiciones "nombre tipo" del esquema, armadas una sola vez para el DDL
+KNOWN_FACES_COLUMN_DDL = tuple(f"{name} {col_type}" for name, col_type in KNOWN_FACES_COLUMNS)
+
+# Índices secundarios de known_faces
+KNOWN_FACES_INDEXES = {
+    'idx_known_faces_cedula':
+        "CREATE INDEX IF NOT EXISTS idx_known_faces_cedula ON known_faces(cedula)",
+    'idx_known_faces_case_number':
+        "CREATE INDEX IF NOT EXISTS idx_known_faces_case_number ON known_faces(case_number)",
+}
+
 def migrate_database():
     """Migrar base de datos existente"""
     
@@ -17,16 +58,36 @@ def migrate_database():
         conn = sqlite3.connect(str(db_path))
         cursor = conn.cursor()
         
-        # Verificar si la tabla existe
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='known_faces'")
-        if not cursor.fetchone():
+        # Migración de un solo uso y reejecutable desde el backup: journal en
+        # memoria y sin fsync mientras dura. Se vuelve a WAL antes de cerrar
+        cursor.execute("PRAGMA synchronous=OFF")
+        cursor.execute("PRAGMA journal_mode=MEMORY")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        # 64 MB de caché de páginas y hasta 256 MB mapeados en memoria solo para
+        # esta conexión: la copia y los índices no releen páginas del disco
+        cursor.execute("PRAGMA cache_size=-65536")
+        cursor.execute("PRAGMA mmap_size=268435456")
+        
+        # Columnas existentes; sin filas si la tabla no existe
+        cursor.execute("SELECT name, type FROM pragma_table_info('known_faces')")
+        table_info = cursor.fetchall()
+        if not table_info:
             logger.info("Tabla known_faces no existe, creando...")
             create_new_table(cursor)
+            schema_changed = True
         else:
             logger.info("Tabla known_faces existe, verificando columnas...")
-            migrate_existing_table(cursor)
+            schema_changed = migrate_existing_table(cursor, table_info)
+        
+        # Tras cambiar el esquema las estadísticas del planificador quedan
+        # obsoletas: 0x10002 analiza todas las tablas; si no, optimize normal
+        cursor.execute("PRAGMA optimize=0x10002" if schema_changed else "PRAGMA optimize")
         
         conn.commit()
+        
+        # Restaurar modo durable; WAL queda persistido en el archivo para la app
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
         conn.close()
         
         logger.success("✅ Migración completada exitosamente")
@@ -41,121 +102,225 @@ def migrate_database():
 
 def create_new_table(cursor):
     """Crear tabla known_faces desde cero"""
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS known_faces (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            lastname TEXT,
-            age INTEGER,
-            cedula TEXT UNIQUE,
-            birth_date TEXT,
-            crime TEXT,
-            case_number TEXT,
-            embedding BLOB NOT NULL,
-            image_path TEXT NOT NULL,
-            created_at REAL NOT NULL,
-            created_by INTEGER,
+    cursor.execute(known_faces_ddl('known_faces'))
+    
+    # Crear índices. La tabla está vacía, así que da igual crearlos antes de los
+    # datos; en cargas masivas (clone_known_faces_table) van siempre después
+    for sql in KNOWN_FACES_INDEXES.values():
+        cursor.execute(sql)
+    
+    logger.info("Tabla known_faces creada exitosamente")
+
+
+def known_faces_ddl(table, extra_columns=()):
+    """CREATE TABLE del esquema completo de known_faces, más columnas extra (nombre, tipo)"""
+    columns = ',\n            '.join(
+        KNOWN_FACES_COLUMN_DDL
+        + tuple(f"{name} {col_type}".rstrip() for name, col_type in extra_columns))
+    return f'''
+        CREATE TABLE IF NOT EXISTS {table} (
+            {columns},
             FOREIGN KEY (created_by) REFERENCES users(id)
         )
-    ''')
+    '''
+
+
+def clone_known_faces_table(cursor, table_info):
+    """
+    Reconstruir known_faces con el esquema completo en una sola transacción:
+    crear known_faces_new, copiar las filas, borrar la tabla vieja y renombrar.
+    A diferencia de ALTER TABLE ADD COLUMN conserva el UNIQUE de cedula.
+    Las columnas que no están en el esquema (p. ej. las que agrega FaceDatabase)
+    se conservan, y los índices y triggers existentes se vuelven a crear.
+    """
+    old_columns = dict(table_info)
+    schema_names = {name for name, _ in KNOWN_FACES_COLUMNS}
+    extra_columns = [(name, col_type) for name, col_type in old_columns.items()
+                     if name not in schema_names]
+    
+    # Columnas a copiar; cedula se completa en la misma pasada
+    target_columns = [name for name, _ in KNOWN_FACES_COLUMNS + tuple(extra_columns)
+                      if name in old_columns or name == 'cedula']
+    select_exprs = [
+        ("COALESCE(cedula, 'UNKNOWN_' || id)" if 'cedula' in old_columns else "'UNKNOWN_' || id")
+        if name == 'cedula' else name
+        for name in target_columns
+    ]
     
-    # Crear índices
-    cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_known_faces_cedula 
-        ON known_faces(cedula)
-    ''')
     cursor.execute('''
-        CREATE INDEX IF NOT EXISTS idx_known_faces_case_number 
-        ON known_faces(case_number)
+        SELECT sql FROM sqlite_master
+        WHERE tbl_name = 'known_faces' AND type IN ('index', 'trigger') AND sql IS NOT NULL
     ''')
+    dependent_sql = [row[0] for row in cursor.fetchall()]
     
-    logger.info("Tabla known_faces creada exitosamente")
+    # Todo el clone en un solo executescript: un viaje a SQLite y un único
+    # punto de commit. Índices y triggers van después de la copia: un
+    # ordenamiento por índice en lugar de mantener cada B-tree fila a fila
+    script = ';\n'.join([
+        "BEGIN IMMEDIATE",
+        "DROP TABLE IF EXISTS known_faces_new",
+        known_faces_ddl('known_faces_new', extra_columns),
+        f"INSERT INTO known_faces_new ({', '.join(target_columns)}) "
+        f"SELECT {', '.join(select_exprs)} FROM known_faces",
+        "DROP TABLE known_faces",
+        "ALTER TABLE known_faces_new RENAME TO known_faces",
+        *dependent_sql,
+        *KNOWN_FACES_INDEXES.values(),
+        "ANALYZE known_faces",
+        "COMMIT",
+    ]) + ';'
+    
+    # Sin verificación de claves foráneas durante la copia: son las mismas filas,
+    # así que no hace falta buscar cada created_by en users. Se valida al final
+    cursor.execute("PRAGMA foreign_keys")
+    foreign_keys = cursor.fetchone()[0]
+    cursor.execute("PRAGMA foreign_keys=OFF")
+    try:
+        cursor.executescript(script)
+    except Exception:
+        if cursor.connection.in_transaction:
+            cursor.execute("ROLLBACK")
+        raise
+    finally:
+        cursor.execute(f"PRAGMA foreign_keys={foreign_keys}")
+    
+    cursor.execute("PRAGMA foreign_key_check(known_faces)")
+    violations = cursor.fetchall()
+    if violations:
+        logger.warning(f"{len(violations)} registros de known_faces con created_by inexistente en users")
 
 
-def migrate_existing_table(cursor):
-    """Migrar tabla existing agregando nuevas columnas"""
-    
-    # Obtener información de las columnas existentes
-    cursor.execute("PRAGMA table_info(known_faces)")
-    columns = [row[1] for row in cursor.fetchall()]
-    
-    logger.info(f"Columnas actuales: {columns}")
-    
-    # Definir columnas requeridas
-    required_columns = {
-        'lastname': 'TEXT',
-        'age': 'INTEGER',
-        'cedula': 'TEXT UNIQUE',
-        'birth_date': 'TEXT',
-        'crime': 'TEXT',
-        'case_number': 'TEXT'
-    }
-    
-    # Agregar columnas faltantes
-    for col_name, col_type in required_columns.items():
-        if col_name not in columns:
-            logger.info(f"Agregando columna: {col_name}")
-            try:
-                # Para cedula que debe ser UNIQUE, manejar diferente
-                if col_name == 'cedula':
-                    cursor.execute(f'ALTER TABLE known_faces ADD COLUMN {col_name} {col_type} DEFAULT NULL')
-                else:
-                    cursor.execute(f'ALTER TABLE known_faces ADD COLUMN {col_name} {col_type}')
-                logger.info(f"✅ Columna {col_name} agregada")
-            except Exception as e:
-                logger.error(f"Error al agregar columna {col_name}: {e}")
-                # Si falla por ser UNIQUE, agregar sin constraint
-                if 'UNIQUE' in col_type:
-                    cursor.execute(f'ALTER TABLE known_faces ADD COLUMN {col_name} TEXT')
-                    logger.info(f"✅ Columna {col_name} agregada (sin UNIQUE constraint)")
-        else:
+def migrate_existing_table(cursor, table_info) -> bool:
+    """
+    Migrar tabla existing agregando nuevas columnas
+    
+    Args:
+        table_info: Filas (nombre, tipo) de pragma_table_info('known_faces')
+    
+    Returns:
+        True si se modificó el esquema o los datos
+    """
+    changed = False
+    
+    columns = {row[0] for row in table_info}
+    
+    logger.info(f"Columnas actuales: {[row[0] for row in table_info]}")
+    
+    missing = [col_name for col_name, _ in REQUIRED_COLUMNS if col_name not in columns]
+    for col_name, _ in REQUIRED_COLUMNS:
+        if col_name in columns:
             logger.info(f"✓ Columna {col_name} ya existe")
     
-    # Crear índices si no existen
-    try:
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_known_faces_cedula 
-            ON known_faces(cedula)
-        ''')
-        logger.info("Índice cedula creado/verificado")
-    except Exception as e:
-        logger.warning(f"No se pudo crear índice cedula: {e}")
+    # Todas las columnas faltantes en una sola reconstrucción de la tabla
+    if missing:
+        logger.info(f"Agregando columnas: {', '.join(missing)}")
+        clone_known_faces_table(cursor, table_info)
+        changed = True
+        logger.info(f"✅ Columnas agregadas: {', '.join(missing)}")
     
-    try:
-        cursor.execute('''
-            CREATE INDEX IF NOT EXISTS idx_known_faces_case_number 
-            ON known_faces(case_number)
-        ''')
-        logger.info("Índice case_number creado/verificado")
-    except Exception as e:
-        logger.warning(f"No se pudo crear índice case_number: {e}")
+    # Índices existentes en una sola consulta; solo se crean los que faltan
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='index' AND tbl_name='known_faces'")
+    indexes = {row[0] for row in cursor.fetchall()}
+    
+    # Caso habitual tras la primera ejecución: columnas, índices y cédulas ya
+    # están; se sale sin abrir ninguna transacción de escritura
+    if REQUIRED_COLUMN_NAMES <= columns and indexes.issuperset(KNOWN_FACES_INDEXES):
+        cursor.execute("SELECT 1 FROM known_faces WHERE cedula IS NULL LIMIT 1")
+        if cursor.fetchone() is None and cedula_is_unique(cursor):
+            logger.info("Esquema de known_faces al día, nada que migrar")
+            return False
     
-    # Poblar cedula con valores por defecto si están vacías
-    cursor.execute("SELECT COUNT(*) FROM known_faces WHERE cedula IS NULL")
-    null_count = cursor.fetchone()[0]
+    for index_name, sql in KNOWN_FACES_INDEXES.items():
+        if index_name in indexes:
+            continue
+        try:
+            cursor.execute(sql)
+            changed = True
+            logger.info(f"Índice {index_name} creado")
+        except Exception as e:
+            logger.warning(f"No se pudo crear índice {index_name}: {e}")
+    
+    # Poblar cedula con valores por defecto si están vacías.
+    # idx_known_faces_cedula ya existe aquí, así que "cedula IS NULL" se resuelve
+    # por el índice en lugar de recorrer la tabla; rowcount evita un COUNT(*) previo
+    cursor.execute('''
+        UPDATE known_faces 
+        SET cedula = 'UNKNOWN_' || id
+        WHERE cedula IS NULL
+    ''')
+    null_count = cursor.rowcount
     
     if null_count > 0:
-        logger.info(f"Poblando {null_count} registros con cédula por defecto...")
-        cursor.execute('''
-            UPDATE known_faces 
-            SET cedula = 'UNKNOWN_' || id
-            WHERE cedula IS NULL
-        ''')
-        logger.info(f"✅ {null_count} registros actualizados")
+        changed = True
+        logger.info(f"✅ {null_count} registros poblados con cédula por defecto")
+    
+    # ALTER TABLE ADD COLUMN no admite UNIQUE, así que las tablas migradas por
+    # esa vía quedaron sin la restricción: se impone con un índice único una
+    # vez que ya no hay cédulas NULL que rellenar
+    if not cedula_is_unique(cursor):
+        try:
+            cursor.execute('''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_known_faces_cedula_unique
+                ON known_faces(cedula)
+            ''')
+            changed = True
+            logger.info("Índice único de cedula creado")
+        except Exception as e:
+            logger.warning(f"No se pudo crear índice único de cedula: {e}")
+    
+    return changed
+
+
+def cedula_is_unique(cursor) -> bool:
+    """
+    Verificar si known_faces.cedula ya tiene un índice único propio
+    (restricción UNIQUE de la tabla o CREATE UNIQUE INDEX)
+    
+    Returns:
+        True si existe un índice único sobre cedula
+    """
+    cursor.execute('''
+        SELECT 1 FROM pragma_index_list('known_faces') AS il
+        JOIN pragma_index_info(il.name) AS ii
+        WHERE il."unique" = 1
+        GROUP BY il.name
+        HAVING COUNT(*) = 1 AND MIN(ii.name) = 'cedula'
+    ''')
+    return cursor.fetchone() is not None
 
 
 def backup_database():
     """Crear backup de la base de datos antes de migrar"""
-    import shutil
-    from datetime import datetime
-    
     db_path = Path('data/database.db')
     
     if db_path.exists():
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_path = Path(f'data/database_backup_{timestamp}.db')
         
-        shutil.copy2(db_path, backup_path)
+        # VACUUM INTO: instantánea consistente (incluidas las páginas que aún
+        # están en el -wal) y compactada, sin copiar páginas libres
+        # VACUUM INTO no sobrescribe: un backup del mismo segundo se reemplaza
+        backup_path.unlink(missing_ok=True)
+        source = sqlite3.connect(str(db_path))
+        try:
+            source.execute("VACUUM INTO ?", (str(backup_path),))
+        finally:
+            source.close()
+        
+        # Huella SHA-256 en formato sha256sum para poder verificar el backup
+        with open(backup_path, 'rb') as f:
+            if hasattr(hashlib, 'file_digest'):
+                digest = hashlib.file_digest(f, 'sha256').hexdigest()
+            else:
+                # Python < 3.11: lectura por bloques de 1 MiB
+                sha256 = hashlib.sha256()
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    sha256.update(chunk)
+                digest = sha256.hexdigest()
+        backup_path.with_name(backup_path.name + '.sha256').write_text(
+            f"{digest}  {backup_path.name}\n")
+        logger.info(f"SHA-256 del backup: {digest}")
+        
         logger.info(f"✅ Backup creado: {backup_path}")
         print(f"✅ Backup creado: {backup_path}")
         return True
@@ -163,8 +328,19 @@ def backup_database():
     return False
 
 
+def setup_logging():
+    """
+    Sinks de loguru para el script: encolados en un hilo de fondo para que
+    los logs por columna no escriban a disco dentro de la migración
+    """
+    logger.remove()
+    logger.add(sys.stderr, level="INFO", enqueue=True)
+    logger.add("logs/migrate.log", rotation="10 MB", level="INFO", enqueue=True)
+    logger.add("logs/error.log", rotation="10 MB", retention="30 days", level="ERROR", enqueue=True)
+
+
 if __name__ == "__main__":
-    import sys
+    setup_logging()
     
     print("=" * 60)
     print("🔄 Script de Migración de Base de Datos")
@@ -2,21 +2,29 @@ import sqlite3
 from pathlib import Path
 
 def migrate():
-    conn = sqlite3.connect('data/database.db')
+    # Transacciones manuales: una sola transacción para todos los UPDATE
+    conn = sqlite3.connect('data/database.db', isolation_level=None)
     cursor = conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
     
-    # Para rostros existentes sin datos adicionales
+    cursor.execute("BEGIN IMMEDIATE")
+    
+    # Para rostros existentes sin datos adicionales: cada columna vacía recibe
+    # su valor por defecto en una sola pasada, sin tocar las ya completadas
     cursor.execute('''
         UPDATE known_faces 
-        SET lastname = 'Por definir',
-            age = 0,
-            birth_date = '1900-01-01',
-            crime = 'No especificado',
-            case_number = 'N/A'
-        WHERE lastname IS NULL
+        SET lastname = COALESCE(lastname, 'Por definir'),
+            age = COALESCE(age, 0),
+            birth_date = COALESCE(birth_date, '1900-01-01'),
+            crime = COALESCE(crime, 'No especificado'),
+            case_number = COALESCE(case_number, 'N/A')
+        WHERE lastname IS NULL OR age IS NULL OR birth_date IS NULL
+            OR crime IS NULL OR case_number IS NULL
     ''')
     
-    conn.commit()
+    cursor.execute("COMMIT")
     conn.close()
     print("✅ Migración completada")
 
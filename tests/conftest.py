@@ -0,0 +1,37 @@
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+# Make core/ and ui/ importable when pytest is run from any directory
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Threads started together by run_threads
+THREADS = 8
+
+
+@pytest.fixture
+def run_threads():
+    """run_threads(target, count) runs target(thread_index) on count threads started together"""
+    def run(target, count: int = THREADS) -> None:
+        barrier = threading.Barrier(count)
+        errors = []
+
+        def worker(index):
+            try:
+                barrier.wait()
+                target(index)
+            except BaseException as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        # Re-raise the first failure in the test's own thread
+        if errors:
+            raise errors[0]
+
+    return run
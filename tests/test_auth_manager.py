@@ -0,0 +1,67 @@
+import bcrypt
+import pytest
+
+from core.auth_manager import AuthManager
+
+# Threads started by run_threads, and calls per thread
+THREADS = 8
+ITERATIONS = 50
+
+
+@pytest.fixture
+def auth_manager():
+    return AuthManager(database=None, bcrypt_target_ms=1)
+
+
+# ============ Verify cache ============
+
+def test_verify_cache_matches_password_to_hash(auth_manager, run_threads):
+    auth_manager._verify_cache_size = 4
+    hashes = [bcrypt.hashpw(f"pw{i}".encode(), bcrypt.gensalt(rounds=4)).decode()
+              for i in range(THREADS)]
+
+    def worker(index):
+        for i in range(ITERATIONS):
+            other = (index + 1 + i % (THREADS - 1)) % THREADS
+            assert auth_manager.verify_password(f"pw{index}", hashes[index])
+            assert not auth_manager.verify_password(f"pw{index}", hashes[other])
+
+    run_threads(worker, THREADS)
+    assert len(auth_manager._verify_cache) <= auth_manager._verify_cache_size
+
+
+# ============ Failed attempts ============
+
+def test_failed_attempts_stay_bounded(auth_manager, run_threads):
+    auth_manager.max_tracked_users = 16
+
+    def worker(index):
+        for i in range(ITERATIONS):
+            auth_manager.record_failed_attempt(f"user{index}_{i}")
+            auth_manager.is_locked_out(f"user{index}_{i // 2}")
+
+    run_threads(worker, THREADS)
+    assert len(auth_manager.failed_attempts) <= auth_manager.max_tracked_users
+
+
+def test_failed_attempts_evict_least_recently_active(auth_manager):
+    auth_manager.max_tracked_users = 3
+    for username in ('a', 'b', 'c'):
+        auth_manager.record_failed_attempt(username)
+    auth_manager.record_failed_attempt('a')
+    auth_manager.record_failed_attempt('d')
+
+    assert list(auth_manager.failed_attempts) == ['c', 'a', 'd']
+
+
+def test_failed_attempts_counted_per_user(auth_manager, run_threads):
+    # Logins run concurrently on _BCRYPT_POOL, so every count goes through _lock
+    def worker(index):
+        username = f"user{index}"
+        for i in range(auth_manager.max_login_attempts):
+            assert auth_manager.record_failed_attempt(username) == auth_manager.max_login_attempts - i - 1
+        assert auth_manager.is_locked_out(username)
+        auth_manager.clear_failed_attempts(username)
+        assert not auth_manager.is_locked_out(username)
+
+    run_threads(worker, THREADS)
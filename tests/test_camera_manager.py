@@ -0,0 +1,98 @@
+import subprocess
+import sys
+from multiprocessing import shared_memory
+from pathlib import Path
+
+import cv2
+import numpy as np
+import pytest
+import yaml
+
+from core.camera_manager import (_SHM_HEADER_SIZE, CameraManager, SharedFrameBuffer,
+                                 read_shared_frame)
+
+
+@pytest.fixture
+def camera_manager(tmp_path):
+    config_path = tmp_path / "camera_config.yaml"
+    config_path.write_text(yaml.safe_dump({'cameras': [
+        {'id': 0, 'name': "Entrada", 'source': "0", 'threads': 3,
+         'resolution': {'width': 64, 'height': 48}},
+        {'id': 1, 'name': "Patio", 'source': "1", 'enabled': False,
+         'resolution': {'width': 64, 'height': 48}},
+    ]}))
+    manager = CameraManager(str(config_path))
+    yield manager
+    manager.stop_all_cameras()
+
+
+# ============ Configuration ============
+
+def test_loading_config_leaves_opencv_threads_alone(camera_manager, tmp_path):
+    threads = cv2.getNumThreads()
+    camera_manager.load_config(str(tmp_path / "camera_config.yaml"))
+
+    assert camera_manager.cameras[0].threads == 3
+    assert cv2.getNumThreads() == threads
+
+
+# ============ Status ============
+
+def test_camera_status_cache_is_not_shared_with_callers(camera_manager):
+    statuses = camera_manager.get_all_camera_status()
+    assert [status['name'] for status in statuses] == ["Entrada", "Patio"]
+
+    statuses[0]['name'] = "changed"
+    statuses.clear()
+    camera_manager.get_camera_status(1)['enabled'] = True
+
+    # Served from the cache, which the edits above must not have touched
+    statuses = camera_manager.get_all_camera_status()
+    assert [(status['name'], status['enabled']) for status in statuses] == [
+        ("Entrada", True), ("Patio", False)]
+
+
+# ============ Shared memory ============
+
+READER = """
+import sys
+from multiprocessing import resource_tracker, shared_memory
+from core.camera_manager import read_shared_frame
+
+shm = shared_memory.SharedMemory(name=sys.argv[1])
+# Python < 3.13 would otherwise unlink the block when this reader exits
+resource_tracker.unregister(shm._name, "shared_memory")
+try:
+    result = read_shared_frame(shm, (4, 6, 3), last_seq=int(sys.argv[2]))
+    print("none" if result is None else f"{result[0]} {int(result[1].sum())}")
+finally:
+    shm.close()
+"""
+
+
+def read_in_other_process(name: str, last_seq: int) -> str:
+    """Poll the shared block from a process that was not spawned by this one"""
+    return subprocess.run([sys.executable, "-c", READER, name, str(last_seq)],
+                          cwd=Path(__file__).resolve().parent.parent,
+                          capture_output=True, text=True, check=True).stdout.strip()
+
+
+def test_shared_frames_are_found_by_polling_the_sequence(camera_manager):
+    shape = (4, 6, 3)
+    frame_size = shape[0] * shape[1] * shape[2]
+    shm = shared_memory.SharedMemory(create=True, size=_SHM_HEADER_SIZE + 2 * frame_size)
+    shared = SharedFrameBuffer(shm=shm, shape=shape)
+    try:
+        assert read_shared_frame(shm, shape) is None
+
+        for value in (1, 2, 3):
+            camera_manager._publish_shared_frame(0, shared, np.full(shape, value, dtype=np.uint8))
+        seq, frame = read_shared_frame(shm, shape)
+        assert seq == 3 and (frame == 3).all()
+        assert read_shared_frame(shm, shape, last_seq=seq) is None
+
+        assert read_in_other_process(shm.name, 0) == f"3 {3 * frame_size}"
+        assert read_in_other_process(shm.name, 3) == "none"
+    finally:
+        shm.close()
+        shm.unlink()
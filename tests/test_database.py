@@ -0,0 +1,182 @@
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from core import database as database_module
+from core.database import CURRENT_SCHEMA_VERSION, FaceDatabase, _SELECT_FACE_LOGS
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = FaceDatabase(str(tmp_path / "database.db"))
+    yield db
+    db.close()
+
+
+def add_face(database, cedula: str, embedding: np.ndarray, created_by=None) -> bool:
+    return database.add_known_face(f"name {cedula}", "lastname", 30, cedula, "2000-01-01",
+                                   "", "", embedding.astype(np.float32).tobytes(),
+                                   f"{cedula}.jpg", created_by)
+
+
+# ============ MIGRATIONS ============
+
+def test_legacy_database_is_migrated_once(tmp_path):
+    db_path = tmp_path / "database.db"
+    # Oldest released layout: no identity columns, face_logs without user_id
+    with sqlite3.connect(db_path) as conn:
+        conn.executescript('''
+            CREATE TABLE known_faces (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT NOT NULL,
+                                      embedding BLOB NOT NULL, image_path TEXT NOT NULL,
+                                      created_at REAL NOT NULL);
+            CREATE TABLE face_logs (id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp REAL NOT NULL,
+                                    camera_id INTEGER NOT NULL, camera_name TEXT NOT NULL,
+                                    face_name TEXT NOT NULL, age INTEGER, gender TEXT,
+                                    confidence REAL NOT NULL, screenshot_path TEXT);
+            INSERT INTO known_faces (name, embedding, image_path, created_at)
+            VALUES ('old', x'0000803f', 'old.jpg', 0);
+        ''')
+    conn.close()
+
+    db = FaceDatabase(str(db_path))
+    try:
+        assert db._conn.execute("PRAGMA user_version").fetchone()[0] == CURRENT_SCHEMA_VERSION
+        assert "user_id" in {row[1] for row in db._conn.execute("PRAGMA table_info(face_logs)")}
+        (face,) = db.get_known_faces()
+        assert face['cedula'] == f"UNKNOWN_{face['id']}"
+        indexes = {row[0] for row in db._conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        assert {"idx_face_logs_camera_ts", "idx_face_logs_name_ts"} <= indexes
+    finally:
+        db.close()
+
+    # Reopening a current database skips the schema script entirely
+    statements = []
+    connect = FaceDatabase._connect
+
+    def traced_connect(*args, **kwargs):
+        conn = connect(*args, **kwargs)
+        conn.set_trace_callback(statements.append)
+        return conn
+
+    with mock.patch.object(FaceDatabase, "_connect", staticmethod(traced_connect)):
+        FaceDatabase(str(db_path)).close()
+    assert statements
+    assert not any("CREATE " in statement for statement in statements)
+
+# ============ KNOWN FACES ============
+
+def test_known_face_embeddings_come_from_the_blob(database, tmp_path):
+    embeddings = np.arange(12, dtype=np.float32).reshape(3, 4)
+    for i, embedding in enumerate(embeddings):
+        assert add_face(database, f"c{i}", embedding)
+
+    faces = database.get_known_faces()
+    np.testing.assert_array_equal(np.stack([face['embedding'] for face in faces]), embeddings)
+
+    # The database file is the only copy: nothing else is written next to it
+    assert not list(tmp_path.glob("*.f32"))
+
+
+def test_known_faces_matrix_is_cached_until_known_faces_change(database):
+    embeddings = np.arange(12, dtype=np.float32).reshape(3, 4)
+    for i, embedding in enumerate(embeddings):
+        add_face(database, f"c{i}", embedding)
+
+    matrix, ids = database.get_known_faces_matrix()
+    np.testing.assert_array_equal(matrix, embeddings)
+    assert ids == [face['id'] for face in database.get_known_faces(with_embeddings=False)]
+    assert database.get_known_faces_matrix()[0] is matrix
+
+    database.delete_known_face("c1")
+    matrix, ids = database.get_known_faces_matrix()
+    np.testing.assert_array_equal(matrix, embeddings[[0, 2]])
+    assert len(ids) == 2
+
+
+# ============ FACE LOGS ============
+
+def make_event(timestamp: float, camera_id: int = 0, face_name: str = "face") -> SimpleNamespace:
+    return SimpleNamespace(timestamp=timestamp, camera_id=camera_id, camera_name="cam",
+                           face_name=face_name, age=None, gender=None, confidence=0.9,
+                           screenshot_path=None)
+
+
+@pytest.mark.parametrize("column, index, value", [
+    ("camera_id", "idx_face_logs_camera_ts", 1),
+    ("face_name", "idx_face_logs_name_ts", "name"),
+])
+def test_filtered_face_logs_are_read_in_index_order(database, column, index, value):
+    query = f"{_SELECT_FACE_LOGS} WHERE {column} = ? ORDER BY timestamp DESC, id DESC LIMIT ?"
+    plan = " ".join(row[3] for row in database._conn.execute("EXPLAIN QUERY PLAN " + query, (value, 10)))
+
+    assert index in plan
+    # Tied timestamps fall back to id inside the index, no sort step
+    assert "TEMP B-TREE" not in plan
+
+
+def test_face_logs_page_through_tied_timestamps(database):
+    # Three events per timestamp so page boundaries fall inside a tie
+    for i in range(30):
+        database.log_face_event(make_event(1000.0 + i // 3, camera_id=i % 2))
+    database.flush()
+
+    for filters in ({}, {'camera_id': 0}, {'face_name': "face"}):
+        expected = database.get_face_logs(limit=100, **filters)
+        pages, last = [], None
+        while True:
+            page = database.get_face_logs(limit=4, **filters,
+                                          before_timestamp=last and last.timestamp,
+                                          before_id=last and last.id)
+            if not page:
+                break
+            pages.extend(page)
+            last = page[-1]
+
+        assert [entry.id for entry in pages] == [entry.id for entry in expected]
+        assert [(e.timestamp, e.id) for e in expected] == sorted(
+            ((e.timestamp, e.id) for e in expected), reverse=True)
+
+
+def test_full_write_queue_counts_dropped_rows(tmp_path, monkeypatch):
+    monkeypatch.setattr(database_module, "_WRITE_QUEUE_SIZE", 2)
+    monkeypatch.setattr(database_module, "_WRITE_QUEUE_TIMEOUT", 0.01)
+    db = FaceDatabase(str(tmp_path / "database.db"))
+    try:
+        # Stall the writer so the queue fills up
+        with db._write_lock:
+            attempts = 0
+            while db.dropped_writes == 0 and attempts < 1000:
+                db.log_face_event(make_event(float(attempts)))
+                attempts += 1
+        db.flush()
+
+        assert db.dropped_writes > 0
+        assert len(db.get_face_logs(limit=attempts)) + db.dropped_writes == attempts
+    finally:
+        db.close()
+
+
+# ============ CONNECTIONS ============
+
+def test_each_thread_reads_through_its_own_connection(database):
+    for i in range(20):
+        database.log_face_event(make_event(float(i)))
+    database.flush()
+    barrier = threading.Barrier(4)
+
+    def read(_):
+        barrier.wait()
+        for _ in range(50):
+            assert [entry.timestamp for entry in database.get_face_logs(limit=20)] == \
+                [float(i) for i in reversed(range(20))]
+        return database._read_conn
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        connections = list(pool.map(read, range(4)))
+
+    assert len({id(conn) for conn in connections}) == 4
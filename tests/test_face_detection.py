@@ -0,0 +1,186 @@
+import time
+from types import SimpleNamespace
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from core.database import FaceDatabase
+
+# core.face_detection imports onnxruntime and insightface at module level
+face_detection = pytest.importorskip("core.face_detection")
+FaceDetector = face_detection.FaceDetector
+
+# Calls per thread in the concurrency tests
+ITERATIONS = 50
+
+CONFIG = {
+    'recognition': {
+        'recognition_threshold': 0.5,
+        'detection_threshold': 0.5,
+        'max_batch_size': 8,
+        'device': 'cpu',
+        'analysis_enabled': False,
+    }
+}
+
+
+@pytest.fixture
+def detector():
+    with mock.patch.object(FaceDetector, '_load_model', return_value=SimpleNamespace(models={})):
+        return FaceDetector(CONFIG)
+
+
+@pytest.fixture
+def database(tmp_path):
+    db = FaceDatabase(str(tmp_path / "database.db"))
+    yield db
+    db.close()
+
+
+def make_known_face(name: str, embedding: np.ndarray) -> face_detection.KnownFace:
+    return face_detection.KnownFace(name=name, lastname="", age=0, cedula=name, birth_date="",
+                                    crime="", case_number="", embedding=embedding, image_path="")
+
+
+def make_face(embedding: np.ndarray) -> face_detection.Face:
+    return face_detection.Face(bbox=np.zeros(4), kps=np.zeros((5, 2)), det_score=1.0,
+                               embedding=embedding)
+
+
+def add_face(database, cedula: str, embedding: np.ndarray) -> bool:
+    return database.add_known_face(f"name {cedula}", "lastname", 30, cedula, "2000-01-01",
+                                   "", "", embedding.astype(np.float32).tobytes(), f"{cedula}.jpg")
+
+
+# ============ _IOBoundSession ============
+
+class FakeOrtValue:
+    def __init__(self, shape, dtype):
+        self.array = np.zeros(shape, dtype=dtype)
+
+    def numpy(self):
+        return self.array.copy()
+
+
+class FakeBinding:
+    def __init__(self):
+        self.input = None
+        self.outputs = []
+
+    def bind_cpu_input(self, name, blob):
+        self.input = blob
+
+    def bind_ortvalue_output(self, name, value):
+        self.outputs.append(value)
+
+    def clear_binding_outputs(self):
+        self.outputs = []
+
+
+class FakeSession:
+    """Doubles its input; sleeps before reading the binding to widen races"""
+    def run(self, output_names, input_feed, run_options=None):
+        (blob,) = input_feed.values()
+        return [blob * 2 for _ in output_names]
+
+    def io_binding(self):
+        return FakeBinding()
+
+    def run_with_iobinding(self, binding, run_options=None):
+        time.sleep(0.0005)
+        blob = binding.input
+        for value in binding.outputs:
+            value.array[:] = blob * 2
+
+
+def test_io_bound_session_keeps_outputs_per_thread(run_threads):
+    fake_ort = SimpleNamespace(OrtValue=SimpleNamespace(
+        ortvalue_from_shape_and_type=lambda shape, dtype, device, device_id: FakeOrtValue(shape, dtype)))
+    session = face_detection._IOBoundSession(FakeSession())
+
+    def worker(index):
+        for i in range(ITERATIONS):
+            blob = np.full((1, 3, 4, 4), index * 1000 + i, dtype=np.float32)
+            outputs = session.run(['a', 'b'], {'input': blob})
+            for output in outputs:
+                np.testing.assert_array_equal(output, blob * 2)
+
+    with mock.patch.object(face_detection, 'ort', fake_ort):
+        run_threads(worker)
+
+
+# ============ Recent matches ============
+
+def test_recent_matches_return_each_probes_own_face(detector, run_threads):
+    rng = np.random.default_rng(0)
+    gallery = rng.standard_normal((64, 512)).astype(np.float32)
+    detector.known_faces = [make_known_face(f"p{i}", row) for i, row in enumerate(gallery)]
+    detector._gallery_dirty = True
+
+    def worker(index):
+        local_rng = np.random.default_rng(index)
+        for i in range(ITERATIONS):
+            # More distinct identities per batch than the recent-match LRU holds
+            targets = local_rng.choice(len(gallery), size=4, replace=False)
+            probes = gallery[targets] + 0.1 * local_rng.standard_normal((4, 512)).astype(np.float32)
+            results = detector.recognize_faces([make_face(probe) for probe in probes])
+            assert [known.name for _, known, _ in results] == [f"p{t}" for t in targets]
+
+    run_threads(worker)
+    assert len(detector._recent_matches) <= face_detection._RECENT_MATCHES
+
+
+def test_recent_match_near_threshold_is_confirmed(detector):
+    dim = 8
+    first, second = np.eye(dim, dtype=np.float32)[:2]
+    detector.known_faces = [make_known_face("first", first), make_known_face("second", second)]
+    detector._gallery_dirty = True
+
+    # Prime the recent matches with "first"
+    assert detector.recognize_faces([make_face(first)])[0][1].name == "first"
+
+    # Just above the threshold for "first", but a better match for "second"
+    probe = np.zeros(dim, dtype=np.float32)
+    probe[:3] = 0.55, 0.6, np.sqrt(1 - 0.55 ** 2 - 0.6 ** 2)
+    _, known, similarity = detector.recognize_faces([make_face(probe)])[0]
+    assert known.name == "second"
+    assert similarity == pytest.approx(0.6, abs=1e-3)
+
+
+# ============ Quantization ============
+
+def test_quantize_rows_keeps_zero_rows_zero():
+    matrix = np.array([[0.5, -1.0, 0.25], [0.0, 0.0, 0.0]], dtype=np.float32)
+    with np.errstate(all='raise'):
+        quantized = face_detection._quantize_rows(matrix)
+
+    np.testing.assert_array_equal(quantized, [[64, -127, 32], [0, 0, 0]])
+
+
+# ============ Saved gallery ============
+
+def test_saved_gallery_is_reused_until_known_faces_change(detector, database, tmp_path):
+    rng = np.random.default_rng(0)
+    embeddings = rng.standard_normal((3, 8)).astype(np.float32)
+    for i, embedding in enumerate(embeddings):
+        add_face(database, f"c{i}", embedding)
+
+    detector.load_known_faces_from_db(database)
+    expected = embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)
+    np.testing.assert_allclose(detector.known_matrix, expected, rtol=1e-6)
+    assert sorted(p.name for p in tmp_path.glob("database.gallery.*")) == [
+        "database.gallery.npy", "database.gallery.npz"]
+
+    # Second load memory-maps the saved matrix instead of decoding the BLOBs
+    with mock.patch.object(database, 'get_known_faces_matrix', side_effect=AssertionError):
+        detector.load_known_faces_from_db(database)
+    assert isinstance(detector.known_matrix, np.memmap)
+    np.testing.assert_allclose(detector.known_matrix, expected, rtol=1e-6)
+    assert [kf.cedula for kf in detector.known_faces] == ["c0", "c1", "c2"]
+
+    # Any change to known_faces bumps the version and forces a rebuild
+    database.delete_known_face("c1")
+    detector.load_known_faces_from_db(database)
+    np.testing.assert_allclose(detector.known_matrix, expected[[0, 2]], rtol=1e-6)
+    assert [kf.cedula for kf in detector.known_faces] == ["c0", "c2"]
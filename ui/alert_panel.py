@@ -1,14 +1,22 @@
-from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QPushButton,
-                            QLabel, QCheckBox, QMessageBox, QListWidgetItem, QFrame,
-                            QGraphicsDropShadowEffect, QScrollArea, QWidget, QGridLayout)
-from PyQt5.QtCore import Qt, QSize
-from PyQt5.QtGui import QFont, QColor, QPixmap, QCursor
+from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QListView, QPushButton,
+                            QLabel, QCheckBox, QMessageBox, QFrame, QApplication, QStyle,
+                            QStyledItemDelegate, QStyleOptionViewItem,
+                            QGraphicsDropShadowEffect, QGridLayout)
+from PyQt5.QtCore import (Qt, QObject, QRunnable, QThreadPool, pyqtSignal,
+                          QAbstractListModel, QModelIndex, QPoint, QRect)
+from PyQt5.QtGui import QColor, QPixmap, QImage, QPixmapCache, QPainter, QPalette
 from loguru import logger
 import time
 from pathlib import Path
-import cv2
 from datetime import datetime
 
+# Caché de capturas ya escaladas para la ficha (KB)
+QPixmapCache.setCacheLimit(65536)
+
+# Miniaturas de capturas guardadas junto al original (<captura>.jpg.thumb.jpg)
+THUMBNAIL_SUFFIX = ".thumb.jpg"
+THUMBNAIL_QUALITY = 85
+
 class AlertDetailDialog(QDialog):
     """Ventana de ficha policial estilo ID Card - Sin scroll"""
     
@@ -60,7 +68,11 @@ class AlertDetailDialog(QDialog):
             logger.error(f"Error loading face data: {e}", exc_info=True)
     
     def setup_style(self):
-        """Estilo tipo ficha policial"""
+        """
+        Estilo tipo ficha policial. Todo el estilo de la ficha vive en esta
+        única hoja: los widgets solo llevan objectName/propiedades, así que
+        abrir una ficha analiza el CSS una vez y no una por widget
+        """
         self.setStyleSheet("""
             QDialog {
                 background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
@@ -82,6 +94,129 @@ class AlertDetailDialog(QDialog):
             QPushButton:hover {
                 background-color: rgba(0, 120, 212, 1);
             }
+            QFrame#header {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 rgba(0, 120, 212, 0.4),
+                    stop:1 rgba(0, 120, 212, 0.2));
+                border: 2px solid rgba(0, 120, 212, 0.6);
+                border-radius: 10px;
+                padding: 16px;
+            }
+            QLabel#headerTitle {
+                font-size: 24px;
+                font-weight: bold;
+                color: white;
+                letter-spacing: 2px;
+            }
+            QLabel#headerDate {
+                font-size: 14px;
+                color: rgba(255, 255, 255, 0.9);
+                font-weight: 600;
+            }
+            QFrame#card {
+                background: rgba(255, 255, 255, 0.05);
+                border: 1px solid rgba(255, 255, 255, 0.15);
+                border-radius: 12px;
+                padding: 20px;
+            }
+            QFrame#photoFrame {
+                background-color: rgba(0, 0, 0, 0.4);
+                border: 3px solid rgba(0, 120, 212, 0.5);
+                border-radius: 8px;
+                padding: 8px;
+            }
+            QLabel#photoCaption {
+                font-size: 11px;
+                font-weight: 600;
+                color: rgba(255, 255, 255, 0.7);
+                letter-spacing: 1px;
+            }
+            QLabel#photo {
+                background-color: rgba(0, 0, 0, 0.3);
+                border-radius: 6px;
+            }
+            QLabel#photo[empty="true"] {
+                color: rgba(255, 255, 255, 0.3);
+                font-size: 16px;
+                font-weight: bold;
+            }
+            QLabel#nameLabel {
+                font-size: 22px;
+                font-weight: bold;
+                color: #4FC3F7;
+                letter-spacing: 1px;
+                padding: 12px;
+                background-color: rgba(0, 0, 0, 0.3);
+                border-radius: 6px;
+            }
+            QLabel#confidenceLabel {
+                font-size: 16px;
+                font-weight: 700;
+                background-color: rgba(0, 0, 0, 0.4);
+                padding: 10px;
+                border-radius: 6px;
+            }
+            QLabel#confidenceLabel[confidence="high"] {
+                color: #4CAF50;
+                border: 2px solid #4CAF50;
+            }
+            QLabel#confidenceLabel[confidence="med"] {
+                color: #FFC107;
+                border: 2px solid #FFC107;
+            }
+            QLabel#confidenceLabel[confidence="low"] {
+                color: #F44336;
+                border: 2px solid #F44336;
+            }
+            QFrame#section {
+                background-color: rgba(0, 0, 0, 0.2);
+                border: 1px solid rgba(255, 255, 255, 0.1);
+                border-radius: 8px;
+                padding: 12px;
+            }
+            QFrame#section[alert="true"] {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
+                    stop:0 rgba(244, 67, 54, 0.3),
+                    stop:1 rgba(244, 67, 54, 0.1));
+                border: 2px solid rgba(244, 67, 54, 0.5);
+            }
+            QLabel#sectionTitle {
+                font-size: 13px;
+                font-weight: 700;
+                color: #64B5F6;
+                letter-spacing: 1px;
+                margin-bottom: 4px;
+            }
+            QFrame#sectionLine {
+                background-color: rgba(100, 181, 246, 0.3);
+                border: none;
+                min-height: 2px;
+                max-height: 2px;
+            }
+            QLabel#noData {
+                color: #FFC107;
+                font-size: 12px;
+                font-style: italic;
+            }
+            QLabel#crimeLabel {
+                color: #FF5252;
+                font-size: 12px;
+                font-weight: 600;
+                padding: 6px;
+                background-color: rgba(255, 82, 82, 0.1);
+                border-radius: 4px;
+            }
+            QLabel#rowLabel {
+                color: rgba(255, 255, 255, 0.7);
+                font-size: 12px;
+                font-weight: 600;
+                min-width: 100px;
+            }
+            QLabel#rowValue {
+                color: white;
+                font-size: 12px;
+                font-weight: 500;
+            }
         """)
     
     def init_ui(self):
@@ -123,16 +258,7 @@ class AlertDetailDialog(QDialog):
     def create_header(self):
         """Header tipo ficha oficial"""
         header_frame = QFrame()
-        header_frame.setStyleSheet("""
-            QFrame {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                    stop:0 rgba(0, 120, 212, 0.4),
-                    stop:1 rgba(0, 120, 212, 0.2));
-                border: 2px solid rgba(0, 120, 212, 0.6);
-                border-radius: 10px;
-                padding: 16px;
-            }
-        """)
+        header_frame.setObjectName("header")
         
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(15)
@@ -144,12 +270,7 @@ class AlertDetailDialog(QDialog):
         
         # Título
         title = QLabel("🆔 FICHA DE IDENTIFICACIÓN")
-        title.setStyleSheet("""
-            font-size: 24px;
-            font-weight: bold;
-            color: white;
-            letter-spacing: 2px;
-        """)
+        title.setObjectName("headerTitle")
         header_layout.addWidget(title)
         
         header_layout.addStretch()
@@ -157,11 +278,7 @@ class AlertDetailDialog(QDialog):
         # Fecha/Hora de detección
         time_str = datetime.fromtimestamp(self.alert_event.timestamp).strftime("%d/%m/%Y  %H:%M:%S")
         date_label = QLabel(f"📅 {time_str}")
-        date_label.setStyleSheet("""
-            font-size: 14px;
-            color: rgba(255, 255, 255, 0.9);
-            font-weight: 600;
-        """)
+        date_label.setObjectName("headerDate")
         header_layout.addWidget(date_label)
         
         return header_frame
@@ -169,14 +286,7 @@ class AlertDetailDialog(QDialog):
     def create_left_card(self):
         """Tarjeta izquierda - Foto y datos básicos"""
         card = QFrame()
-        card.setStyleSheet("""
-            QFrame {
-                background: rgba(255, 255, 255, 0.05);
-                border: 1px solid rgba(255, 255, 255, 0.15);
-                border-radius: 12px;
-                padding: 20px;
-            }
-        """)
+        card.setObjectName("card")
         
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(20)
@@ -189,33 +299,18 @@ class AlertDetailDialog(QDialog):
         
         # FOTOGRAFÍA
         photo_container = QFrame()
-        photo_container.setStyleSheet("""
-            QFrame {
-                background-color: rgba(0, 0, 0, 0.4);
-                border: 3px solid rgba(0, 120, 212, 0.5);
-                border-radius: 8px;
-                padding: 8px;
-            }
-        """)
+        photo_container.setObjectName("photoFrame")
         photo_layout = QVBoxLayout(photo_container)
         
         photo_label = QLabel("FOTOGRAFÍA")
-        photo_label.setStyleSheet("""
-            font-size: 11px;
-            font-weight: 600;
-            color: rgba(255, 255, 255, 0.7);
-            letter-spacing: 1px;
-        """)
+        photo_label.setObjectName("photoCaption")
         photo_label.setAlignment(Qt.AlignCenter)
         photo_layout.addWidget(photo_label)
         
         self.image_label = QLabel()
+        self.image_label.setObjectName("photo")
         self.image_label.setAlignment(Qt.AlignCenter)
         self.image_label.setFixedSize(380, 280)
-        self.image_label.setStyleSheet("""
-            background-color: rgba(0, 0, 0, 0.3);
-            border-radius: 6px;
-        """)
         self.load_image()
         photo_layout.addWidget(self.image_label)
         
@@ -228,33 +323,18 @@ class AlertDetailDialog(QDialog):
             full_name = self.alert_event.face_name.upper()
         
         name_label = QLabel(full_name)
-        name_label.setStyleSheet("""
-            font-size: 22px;
-            font-weight: bold;
-            color: #4FC3F7;
-            letter-spacing: 1px;
-            padding: 12px;
-            background-color: rgba(0, 0, 0, 0.3);
-            border-radius: 6px;
-        """)
+        name_label.setObjectName("nameLabel")
         name_label.setAlignment(Qt.AlignCenter)
         name_label.setWordWrap(True)
         card_layout.addWidget(name_label)
         
         # CONFIANZA
         confidence_pct = self.alert_event.confidence * 100 if self.alert_event.confidence <= 1 else self.alert_event.confidence
-        confidence_color = "#4CAF50" if confidence_pct >= 80 else "#FFC107" if confidence_pct >= 60 else "#F44336"
+        confidence_level = "high" if confidence_pct >= 80 else "med" if confidence_pct >= 60 else "low"
         
         confidence_label = QLabel(f"🎯 CONFIANZA: {confidence_pct:.1f}%")
-        confidence_label.setStyleSheet(f"""
-            font-size: 16px;
-            font-weight: 700;
-            color: {confidence_color};
-            background-color: rgba(0, 0, 0, 0.4);
-            padding: 10px;
-            border-radius: 6px;
-            border: 2px solid {confidence_color};
-        """)
+        confidence_label.setObjectName("confidenceLabel")
+        confidence_label.setProperty("confidence", confidence_level)
         confidence_label.setAlignment(Qt.AlignCenter)
         card_layout.addWidget(confidence_label)
         
@@ -265,14 +345,7 @@ class AlertDetailDialog(QDialog):
     def create_right_card(self):
         """Tarjeta derecha - Información detallada"""
         card = QFrame()
-        card.setStyleSheet("""
-            QFrame {
-                background: rgba(255, 255, 255, 0.05);
-                border: 1px solid rgba(255, 255, 255, 0.15);
-                border-radius: 12px;
-                padding: 20px;
-            }
-        """)
+        card.setObjectName("card")
         
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(20)
@@ -307,46 +380,21 @@ class AlertDetailDialog(QDialog):
     def create_section(self, title, is_alert=False):
         """Crear sección de información"""
         section = QFrame()
-        
-        if is_alert:
-            section.setStyleSheet("""
-                QFrame {
-                    background: qlineargradient(x1:0, y1:0, x2:1, y2:0,
-                        stop:0 rgba(244, 67, 54, 0.3),
-                        stop:1 rgba(244, 67, 54, 0.1));
-                    border: 2px solid rgba(244, 67, 54, 0.5);
-                    border-radius: 8px;
-                    padding: 12px;
-                }
-            """)
-        else:
-            section.setStyleSheet("""
-                QFrame {
-                    background-color: rgba(0, 0, 0, 0.2);
-                    border: 1px solid rgba(255, 255, 255, 0.1);
-                    border-radius: 8px;
-                    padding: 12px;
-                }
-            """)
+        section.setObjectName("section")
+        section.setProperty("alert", is_alert)
         
         section_layout = QVBoxLayout(section)
         section_layout.setSpacing(8)
         
         # Título de sección
         title_label = QLabel(title)
-        title_label.setStyleSheet("""
-            font-size: 13px;
-            font-weight: 700;
-            color: #64B5F6;
-            letter-spacing: 1px;
-            margin-bottom: 4px;
-        """)
+        title_label.setObjectName("sectionTitle")
         section_layout.addWidget(title_label)
         
         # Línea separadora
         line = QFrame()
         line.setFrameShape(QFrame.HLine)
-        line.setStyleSheet("background-color: rgba(100, 181, 246, 0.3); max-height: 2px;")
+        line.setObjectName("sectionLine")
         section_layout.addWidget(line)
         
         # Contenido según la sección
@@ -375,7 +423,7 @@ class AlertDetailDialog(QDialog):
                     self.add_data_row(layout, "Fecha Nac.:", self.face_data['birth_date'], "📅")
         else:
             no_data = QLabel("⚠️ Sin datos en base de datos")
-            no_data.setStyleSheet("color: #FFC107; font-size: 12px; font-style: italic;")
+            no_data.setObjectName("noData")
             layout.addWidget(no_data)
     
     def add_biometric_data(self, layout):
@@ -403,14 +451,7 @@ class AlertDetailDialog(QDialog):
         if self.face_data:
             if self.face_data.get('crime'):
                 crime_label = QLabel(f"🚨 {self.face_data['crime']}")
-                crime_label.setStyleSheet("""
-                    color: #FF5252;
-                    font-size: 12px;
-                    font-weight: 600;
-                    padding: 6px;
-                    background-color: rgba(255, 82, 82, 0.1);
-                    border-radius: 4px;
-                """)
+                crime_label.setObjectName("crimeLabel")
                 crime_label.setWordWrap(True)
                 layout.addWidget(crime_label)
             
@@ -428,20 +469,11 @@ class AlertDetailDialog(QDialog):
         row.setSpacing(8)
         
         label_widget = QLabel(f"{icon} {label}")
-        label_widget.setStyleSheet("""
-            color: rgba(255, 255, 255, 0.7);
-            font-size: 12px;
-            font-weight: 600;
-            min-width: 100px;
-        """)
+        label_widget.setObjectName("rowLabel")
         row.addWidget(label_widget)
         
         value_widget = QLabel(str(value))
-        value_widget.setStyleSheet("""
-            color: white;
-            font-size: 12px;
-            font-weight: 500;
-        """)
+        value_widget.setObjectName("rowValue")
         value_widget.setWordWrap(True)
         row.addWidget(value_widget, 1)
         
@@ -451,13 +483,7 @@ class AlertDetailDialog(QDialog):
         """Cargar imagen de captura"""
         if not self.alert_event.screenshot_path:
             self.image_label.setText("📷\n\nSIN IMAGEN")
-            self.image_label.setStyleSheet("""
-                color: rgba(255, 255, 255, 0.3);
-                font-size: 16px;
-                font-weight: bold;
-                background-color: rgba(0, 0, 0, 0.3);
-                border-radius: 6px;
-            """)
+            self.image_label.setProperty("empty", True)
             return
         
         screenshot_path = Path(self.alert_event.screenshot_path)
@@ -466,35 +492,198 @@ class AlertDetailDialog(QDialog):
             return
         
         try:
-            image = cv2.imread(str(screenshot_path))
-            if image is not None:
-                image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-                h, w, ch = image_rgb.shape
-                bytes_per_line = ch * w
-                
-                from PyQt5.QtGui import QImage
-                q_image = QImage(image_rgb.data, w, h, bytes_per_line, QImage.Format_RGB888)
-                pixmap = QPixmap.fromImage(q_image)
-                
-                scaled_pixmap = pixmap.scaled(
-                    self.image_label.width() - 10,
-                    self.image_label.height() - 10,
-                    Qt.KeepAspectRatio,
-                    Qt.SmoothTransformation
-                )
+            # Pixmap ya escalado, por ruta y mtime: reabrir la misma alerta no
+            # vuelve a decodificar ni a escalar la captura
+            self._screenshot_key = f"{screenshot_path}:{screenshot_path.stat().st_mtime_ns}"
+            scaled_pixmap = QPixmapCache.find(self._screenshot_key)
+            if scaled_pixmap is not None:
                 self.image_label.setPixmap(scaled_pixmap)
+                return
+            
+            # Decodificar en el pool de hilos; la ficha se muestra mientras tanto
+            self.image_label.setText("Cargando…")
+            self._screenshot_loader = ScreenshotLoader(
+                screenshot_path,
+                self.image_label.width() - 10,
+                self.image_label.height() - 10
+            )
+            self._screenshot_loader.signals.loaded.connect(self.on_image_loaded)
+            self._screenshot_loader.signals.failed.connect(self.on_image_failed)
+            QThreadPool.globalInstance().start(self._screenshot_loader)
         except Exception as e:
             logger.error(f"Error loading image: {e}")
             self.image_label.setText("❌\n\nERROR AL CARGAR")
+    
+    def on_image_loaded(self, image):
+        """Mostrar la captura decodificada; el QPixmap se crea en el hilo de la GUI"""
+        scaled_pixmap = QPixmap.fromImage(image)
+        QPixmapCache.insert(self._screenshot_key, scaled_pixmap)
+        self.image_label.setPixmap(scaled_pixmap)
+    
+    def on_image_failed(self, error):
+        """Mostrar error de carga de la captura"""
+        logger.error(f"Error loading image: {error}")
+        self.image_label.setText("❌\n\nERROR AL CARGAR")
+
+
+class ScreenshotSignals(QObject):
+    """Señales de ScreenshotLoader (QRunnable no es QObject)"""
+    loaded = pyqtSignal(QImage)
+    failed = pyqtSignal(str)
 
 
-class ClickableAlertItem(QListWidgetItem):
-    """Item de lista clickeable personalizado"""
+class ScreenshotLoader(QRunnable):
+    """
+    Decodificar y escalar una captura fuera del hilo de la GUI. Solo usa
+    QImage, que es reentrante; el QPixmap se crea al recibir la señal
+    """
     
-    def __init__(self, alert_event, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        self.alert_event = alert_event
-        self.setFlags(self.flags() | Qt.ItemIsEnabled | Qt.ItemIsSelectable)
+    def __init__(self, path, width, height):
+        super().__init__()
+        self.path = path
+        self.width = width
+        self.height = height
+        self.signals = ScreenshotSignals()
+    
+    def run(self):
+        # Miniatura en disco junto a la captura: reabrir la ficha en otra sesión
+        # decodifica unos KB en lugar de la captura completa. Se invalida por mtime
+        thumb_path = self.path.with_suffix(self.path.suffix + THUMBNAIL_SUFFIX)
+        try:
+            if thumb_path.exists() and thumb_path.stat().st_mtime >= self.path.stat().st_mtime:
+                thumb = QImage(str(thumb_path))
+                if not thumb.isNull() and thumb.width() <= self.width and thumb.height() <= self.height:
+                    self.signals.loaded.emit(thumb)
+                    return
+        except OSError:
+            pass
+        
+        # Decodificador nativo de Qt: sin ndarray BGR ni copia a RGB
+        image = QImage(str(self.path))
+        if image.isNull():
+            self.signals.failed.emit(f"No se pudo decodificar {self.path}")
+            return
+        scaled = image.scaled(self.width, self.height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        if not scaled.save(str(thumb_path), "JPG", THUMBNAIL_QUALITY):
+            logger.warning(f"No se pudo guardar la miniatura {thumb_path}")
+        self.signals.loaded.emit(scaled)
+
+
+class AlertListModel(QAbstractListModel):
+    """
+    Modelo de la lista de alertas. El texto de cada fila se arma en data(),
+    así que solo se formatean las filas que la vista llega a pintar
+    """
+    AlertRole = Qt.UserRole + 1
+    TIME_FORMAT = "%Y-%m-%d %H:%M:%S"
+    EMPTY_TEXT = "📭 No hay alertas para mostrar"
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.alerts = []
+    
+    def reset(self, alerts):
+        """Reemplazar todas las alertas con un único reset del modelo"""
+        self.beginResetModel()
+        self.alerts = list(alerts)
+        self.endResetModel()
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        # Sin alertas se muestra una fila informativa
+        return len(self.alerts) or 1
+    
+    def flags(self, index):
+        if not self.alerts:
+            return Qt.ItemIsEnabled
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        if not self.alerts:
+            return self.EMPTY_TEXT if role == Qt.DisplayRole else None
+        
+        alert = self.alerts[index.row()]
+        if role == self.AlertRole:
+            return alert
+        if role == Qt.DisplayRole:
+            return self.format_alert(alert)
+        if role == Qt.ForegroundRole:
+            confidence_pct = alert.confidence * 100 if alert.confidence <= 1 else alert.confidence
+            if confidence_pct >= 80:
+                return QColor(76, 175, 80)
+            elif confidence_pct >= 60:
+                return QColor(255, 193, 7)
+            return QColor(244, 67, 54)
+        return None
+    
+    def format_alert(self, alert):
+        """Texto de la fila de una alerta"""
+        time_str = time.strftime(self.TIME_FORMAT, time.localtime(alert.timestamp))
+        confidence_pct = alert.confidence * 100 if alert.confidence <= 1 else alert.confidence
+        
+        item_text = f"🕒 {time_str}  |  👤 {alert.face_name}  |  📹 {alert.camera_name}  |  🎯 {confidence_pct:.1f}%"
+        
+        bio_info = []
+        if alert.age:
+            bio_info.append(f"👶 {alert.age} años")
+        if alert.gender:
+            bio_info.append(f"🚻 {alert.gender}")
+        
+        if bio_info:
+            item_text += f"\n   {' | '.join(bio_info)}"
+        
+        return item_text
+
+
+class AlertDelegate(QStyledItemDelegate):
+    """
+    Pinta el texto de cada fila desde un pixmap en QPixmapCache; el fondo,
+    hover y selección siguen saliendo de la hoja de estilos (::item)
+    """
+    
+    def paint(self, painter, option, index):
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        widget = opt.widget
+        style = widget.style() if widget else QApplication.style()
+        
+        # Mismo margen de texto que aplica el estilo al dibujar el item
+        text_margin = style.pixelMetric(QStyle.PM_FocusFrameHMargin, None, widget) + 1
+        text_rect = style.subElementRect(QStyle.SE_ItemViewItemText, opt, widget)
+        text_rect = text_rect.adjusted(text_margin, 0, -text_margin, 0)
+        text = opt.text
+        selected = bool(opt.state & QStyle.State_Selected)
+        color = opt.palette.color(QPalette.HighlightedText if selected else QPalette.Text)
+        
+        # Panel del item sin texto
+        opt.text = ""
+        style.drawControl(QStyle.CE_ItemViewItem, opt, painter, widget)
+        
+        if not text or text_rect.isEmpty():
+            return
+        
+        alert = index.data(AlertListModel.AlertRole)
+        row_key = f"{id(alert)}:{alert.timestamp}" if alert is not None else "empty"
+        cache_key = f"alert:{row_key}:{text_rect.width()}x{text_rect.height()}:{color.rgba()}"
+        pixmap = QPixmapCache.find(cache_key)
+        if pixmap is None:
+            ratio = widget.devicePixelRatioF() if widget else 1.0
+            pixmap = QPixmap(text_rect.size() * ratio)
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.transparent)
+            
+            text_painter = QPainter(pixmap)
+            text_painter.setFont(opt.font)
+            text_painter.setPen(color)
+            text_painter.drawText(QRect(QPoint(0, 0), text_rect.size()), int(opt.displayAlignment), text)
+            text_painter.end()
+            
+            QPixmapCache.insert(cache_key, pixmap)
+        
+        painter.drawPixmap(text_rect.topLeft(), pixmap)
 
 
 class AlertPanel(QDialog):
@@ -502,6 +691,8 @@ class AlertPanel(QDialog):
         super().__init__()
         self.alert_system = alert_system
         self.database = database
+        # Fichas ya construidas: id(alerta) -> (alerta, diálogo)
+        self._detail_dialogs = {}
         
         self.setWindowTitle("Panel de Alertas")
         self.setGeometry(300, 300, 900, 600)
@@ -522,7 +713,7 @@ class AlertPanel(QDialog):
             QLabel {
                 color: white;
             }
-            QListWidget {
+            QListView {
                 background-color: rgba(255, 255, 255, 0.05);
                 border: 1px solid rgba(255, 255, 255, 0.15);
                 border-radius: 8px;
@@ -530,19 +721,19 @@ class AlertPanel(QDialog):
                 padding: 8px;
                 font-size: 13px;
             }
-            QListWidget::item {
+            QListView::item {
                 background-color: rgba(255, 255, 255, 0.03);
                 border: 1px solid rgba(255, 255, 255, 0.08);
                 border-radius: 6px;
                 padding: 12px;
                 margin: 4px 0;
             }
-            QListWidget::item:hover {
+            QListView::item:hover {
                 background-color: rgba(0, 120, 212, 0.2);
                 border: 1px solid rgba(0, 120, 212, 0.4);
                 cursor: pointer;
             }
-            QListWidget::item:selected {
+            QListView::item:selected {
                 background-color: rgba(0, 120, 212, 0.3);
                 border: 1px solid rgba(0, 120, 212, 0.5);
             }
@@ -620,8 +811,12 @@ class AlertPanel(QDialog):
         layout.addWidget(self.count_label)
         
         # Alert list
-        self.alert_list = QListWidget()
-        self.alert_list.itemClicked.connect(self.on_alert_clicked)
+        # Vista + modelo: solo se pintan las filas visibles
+        self.alert_model = AlertListModel(self)
+        self.alert_list = QListView()
+        self.alert_list.setModel(self.alert_model)
+        self.alert_list.setItemDelegate(AlertDelegate(self.alert_list))
+        self.alert_list.clicked.connect(self.on_alert_clicked)
         layout.addWidget(self.alert_list)
         
         # Controls
@@ -656,46 +851,20 @@ class AlertPanel(QDialog):
         
     def load_alerts(self):
         """Fetch and display alerts"""
-        self.alert_list.clear()
+        # Al actualizar, las fichas se reconstruyen con los datos actuales
+        for _, dialog in self._detail_dialogs.values():
+            dialog.deleteLater()
+        self._detail_dialogs.clear()
+        
         alerts = self.alert_system.get_recent_alerts(50)
         
         self.count_label.setText(f"📋 Total de alertas: {len(alerts)}")
-        
-        if not alerts:
-            item = QListWidgetItem("📭 No hay alertas para mostrar")
-            item.setFlags(Qt.ItemIsEnabled)
-            self.alert_list.addItem(item)
-            return
-        
-        for alert in alerts:
-            time_str = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(alert.timestamp))
-            confidence_pct = alert.confidence * 100 if alert.confidence <= 1 else alert.confidence
-            
-            item_text = f"🕒 {time_str}  |  👤 {alert.face_name}  |  📹 {alert.camera_name}  |  🎯 {confidence_pct:.1f}%"
-            
-            bio_info = []
-            if alert.age:
-                bio_info.append(f"👶 {alert.age} años")
-            if alert.gender:
-                bio_info.append(f"🚻 {alert.gender}")
-            
-            if bio_info:
-                item_text += f"\n   {' | '.join(bio_info)}"
-            
-            item = ClickableAlertItem(alert, item_text)
-            
-            if confidence_pct >= 80:
-                item.setForeground(QColor(76, 175, 80))
-            elif confidence_pct >= 60:
-                item.setForeground(QColor(255, 193, 7))
-            else:
-                item.setForeground(QColor(244, 67, 54))
-            
-            self.alert_list.addItem(item)
+        self.alert_model.reset(alerts)
             
-    def on_alert_clicked(self, item):
+    def on_alert_clicked(self, index):
         """Handle alert click - show detail dialog"""
-        if isinstance(item, ClickableAlertItem):
+        alert_event = index.data(AlertListModel.AlertRole)
+        if alert_event is not None:
             try:
                 if not self.database:
                     QMessageBox.warning(
@@ -705,7 +874,14 @@ class AlertPanel(QDialog):
                     )
                     return
                 
-                detail_dialog = AlertDetailDialog(item.alert_event, self.database, self)
+                # La ficha se construye en la primera apertura y se reutiliza
+                # después: reabrir una alerta no repite consulta, layout ni CSS
+                cached = self._detail_dialogs.get(id(alert_event))
+                if cached and cached[0] is alert_event:
+                    detail_dialog = cached[1]
+                else:
+                    detail_dialog = AlertDetailDialog(alert_event, self.database, self)
+                    self._detail_dialogs[id(alert_event)] = (alert_event, detail_dialog)
                 detail_dialog.exec_()
             except Exception as e:
                 logger.error(f"Error showing alert detail: {e}")
@@ -21,6 +21,11 @@ class HistoryViewer(QWidget):
         self.config = config
         self.current_entry = None
         
+        # Keyset cursor for the next page: (timestamp, id) of the last loaded entry
+        self.page_size = 1000
+        self.page_cursor = None
+        self.loaded_count = 0
+        
         self.setup_ui()
         self.load_camera_list()
         self.load_face_list()
@@ -208,6 +213,28 @@ class HistoryViewer(QWidget):
         self.history_list.currentItemChanged.connect(self.on_history_item_selected)
         list_layout.addWidget(self.history_list)
         
+        # Load the next page of older entries
+        self.load_more_btn = QPushButton("⬇️ Cargar más")
+        self.load_more_btn.clicked.connect(self.load_more_history)
+        self.load_more_btn.setEnabled(False)
+        self.load_more_btn.setStyleSheet("""
+            QPushButton {
+                background-color: rgba(255, 255, 255, 0.08);
+                color: white;
+                border: 1px solid rgba(255, 255, 255, 0.15);
+                border-radius: 6px;
+                padding: 8px 16px;
+                font-size: 13px;
+            }
+            QPushButton:hover {
+                background-color: rgba(255, 255, 255, 0.15);
+            }
+            QPushButton:disabled {
+                color: rgba(255, 255, 255, 0.3);
+            }
+        """)
+        list_layout.addWidget(self.load_more_btn)
+        
         splitter.addWidget(list_frame)
         
         # Details panel
@@ -308,10 +335,21 @@ class HistoryViewer(QWidget):
             logger.error(f"Error loading known faces: {e}")
 
     def refresh_history(self):
-        """Fetch and display filtered history entries from the database in the history list."""
+        """Fetch and display the first page of filtered history entries in the history list."""
+        logger.info("Refreshing history...")
+        self.page_cursor = None
+        self.loaded_count = 0
+        self.history_list.clear()
+        self.load_history_page()
+    
+    def load_more_history(self):
+        """Append the next page of older history entries to the history list."""
+        if self.page_cursor is not None:
+            self.load_history_page()
+    
+    def load_history_page(self):
+        """Fetch one page of filtered history entries, starting after the current page cursor."""
         try:
-            logger.info("Refreshing history...")
-            
             # Get filter values
             start_date = self.start_date.date().toPyDate()
             end_date = self.end_date.date().toPyDate() + timedelta(days=1)  # Include entire end day
@@ -325,20 +363,25 @@ class HistoryViewer(QWidget):
             logger.info(f"Filters - Start: {start_date}, End: {end_date}, Camera: {camera_id}, Face: {face_name}")
             
             # Get filtered history
+            before_timestamp, before_id = self.page_cursor or (None, None)
             entries = self.database.get_face_logs(
-                limit=1000,
+                limit=self.page_size,
                 camera_id=camera_id,
                 face_name=face_name,
                 start_time=start_timestamp,
-                end_time=end_timestamp
+                end_time=end_timestamp,
+                before_timestamp=before_timestamp,
+                before_id=before_id
             )
             
             logger.info(f"Retrieved {len(entries)} entries from database")
             
-            # Populate list
-            self.history_list.clear()
+            # A full page means there may be older entries left
+            self.load_more_btn.setEnabled(len(entries) == self.page_size)
+            if entries:
+                self.page_cursor = (entries[-1].timestamp, entries[-1].id)
             
-            if not entries:
+            if not entries and self.loaded_count == 0:
                 self.count_label.setText("❌ No se encontraron registros con los filtros seleccionados")
                 self.history_list.addItem("No hay registros para mostrar")
                 return
@@ -365,7 +408,8 @@ class HistoryViewer(QWidget):
                     logger.error(f"Entry data: {entry}")
                     continue
             
-            self.count_label.setText(f"✅ Se encontraron {len(entries)} registro(s)")
+            self.loaded_count += len(entries)
+            self.count_label.setText(f"✅ Se encontraron {self.loaded_count} registro(s)")
             logger.info(f"Successfully loaded {len(entries)} entries into list")
                     
         except Exception as e:
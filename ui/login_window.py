@@ -7,6 +7,8 @@ from loguru import logger
 
 class LoginWindow(QDialog):
     login_successful = pyqtSignal(object)  # Emits User object on successful login
+    # Carries (username, future) from the bcrypt pool back to the GUI thread
+    login_finished = pyqtSignal(str, object)
     
     def __init__(self, auth_manager, config):
         super().__init__()
@@ -17,6 +19,8 @@ class LoginWindow(QDialog):
         self.setWindowFlags(Qt.FramelessWindowHint | Qt.WindowStaysOnTopHint)
         self.setAttribute(Qt.WA_TranslucentBackground)
         
+        self.login_finished.connect(self.on_login_finished)
+        
         self.setup_ui()
         self.setup_animations()
         
@@ -280,13 +284,22 @@ class LoginWindow(QDialog):
             self.show_error("Please enter both username and password")
             return
 
+        # Ignore Enter while a login is already running
+        if not self.login_btn.isEnabled():
+            return
+
         # Disable button during login
         self.login_btn.setEnabled(False)
         self.login_btn.setText("Signing in...")
 
+        # bcrypt runs on the auth pool so the dialog keeps repainting
+        future = self.auth_manager.login_async(username, password)
+        future.add_done_callback(lambda f: self.login_finished.emit(username, f))
+
+    def on_login_finished(self, username: str, future):
+        """Handle the result of a login started by login()"""
         try:
-            # Attempt login
-            success, message, user = self.auth_manager.login(username, password)
+            success, message, user = future.result()
 
             if success:
                 logger.info(f"Login successful for user: {username}")
@@ -16,7 +16,6 @@ from pathlib import Path
 from core.face_detection import FaceDetector
 from core.camera_manager import CameraManager
 from core.alert_system import AlertEvent, AlertSystem
-from core.database import FaceDatabase
 from core.utils import numpy_to_pixmap, resize_image, draw_face_info
 from ui.face_manager import FaceManagerDialog
 from ui.alert_panel import AlertPanel
@@ -186,7 +185,7 @@ class MainWindow(QMainWindow):
     # Signal para actualización de frames procesados
     frame_processed = pyqtSignal(int, np.ndarray)
     
-    def __init__(self, config, auth_manager, database):
+    def __init__(self, config, auth_manager, database, face_detector=None):
         super().__init__()
         self.config = config
         self.auth_manager = auth_manager
@@ -207,10 +206,11 @@ class MainWindow(QMainWindow):
         self.cache_timeout = 0.1  # 100ms cache
         
         # Inicializar componentes core
-        self.face_detector = FaceDetector(config)
+        # main.py pre-carga el detector en segundo plano durante el login
+        self.face_detector = face_detector or FaceDetector(config)
         self.camera_manager = CameraManager('config/camera_config.yaml')
         self.alert_system = AlertSystem(config)
-        self.database = FaceDatabase(config['app']['database_path'])
+        self.database = database
         
         self.face_detector.load_known_faces_from_db(database)
         